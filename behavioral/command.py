@@ -1,14 +1,148 @@
+import asyncio
+import inspect
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
 class Light:
     def on(self): return "Light on"
     def off(self): return "Light off"
 
 class Command:
+    receiver = None  # Commands on the same receiver run in submission order
     def execute(self): pass
+    def batch_key(self): return None  # Consecutive commands with equal non-None keys may be batched
+    @classmethod
+    def execute_batch(cls, commands): return [command.execute() for command in commands]
 
 class LightOnCommand(Command):
-    def __init__(self, light): self.light = light
+    def __init__(self, light): self.light = self.receiver = light
     def execute(self): return self.light.on()
+    def batch_key(self): return (LightOnCommand, id(self.light))
+    @classmethod
+    def execute_batch(cls, commands): result = commands[0].light.on(); return [result] * len(commands)  # on() is idempotent
+
+class LightOffCommand(LightOnCommand):
+    def execute(self): return self.light.off()
+    def batch_key(self): return (LightOffCommand, id(self.light))
+    @classmethod
+    def execute_batch(cls, commands): result = commands[0].light.off(); return [result] * len(commands)
+
+class CommandBus:
+    # executor: "inline", "thread" or "asyncio". Each receiver has a lane drained by one worker at a time,
+    # so its commands keep their order while different receivers run concurrently.
+    def __init__(self, executor="thread", maxsize=10_000, workers=4, batch_size=64):
+        self.executor = executor; self.batch_size = batch_size
+        self.slots = threading.BoundedSemaphore(maxsize)  # submit() blocks once maxsize commands are pending
+        self.lock = threading.Lock()
+        self.lanes = {}  # receiver key -> deque of (command, future, submitted_at)
+        self.metrics = {"depth": 0, "max_depth": 0, "executed": 0, "batches": 0, "cancelled": 0,
+                        "latency_total": 0.0, "latency_max": 0.0}
+        if executor == "thread": self.pool = ThreadPoolExecutor(workers)
+        elif executor == "asyncio":
+            self.loop = asyncio.new_event_loop()
+            threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        elif executor != "inline": raise ValueError(f"Unknown executor {executor!r}")
+    def submit(self, command):
+        self.slots.acquire()
+        future = Future()
+        key = id(command.receiver) if command.receiver is not None else ("command", id(command))
+        with self.lock:
+            self.metrics["depth"] += 1
+            self.metrics["max_depth"] = max(self.metrics["max_depth"], self.metrics["depth"])
+            lane = self.lanes.get(key)
+            start = lane is None
+            if start: lane = self.lanes[key] = deque()
+            lane.append((command, future, time.perf_counter()))
+        if start:
+            if self.executor == "inline": self._drain(key)
+            elif self.executor == "thread": self.pool.submit(self._drain, key)
+            else: asyncio.run_coroutine_threadsafe(self._drain_async(key), self.loop)
+        return future
+    def _take(self, key):
+        # Next run of up to batch_size commands from the lane, split into groups of equal batch_key
+        with self.lock:
+            lane = self.lanes[key]
+            if not lane: del self.lanes[key]; return None
+            items = [lane.popleft() for _ in range(min(self.batch_size, len(lane)))]
+        live = [item for item in items if item[1].set_running_or_notify_cancel()]  # Drops futures cancelled while queued
+        if len(live) < len(items):
+            dropped = len(items) - len(live)
+            with self.lock: self.metrics["depth"] -= dropped; self.metrics["cancelled"] += dropped
+            for _ in range(dropped): self.slots.release()
+        groups = []
+        for item in live:
+            try: batch_key = item[0].batch_key()
+            except Exception: batch_key = None  # Runs alone; execute() reports its own errors
+            if groups and batch_key is not None and groups[-1][0] == batch_key: groups[-1][1].append(item)
+            else: groups.append((batch_key, [item]))
+        return [items for _, items in groups]
+    def _run(self, items):
+        commands = [command for command, _, _ in items]
+        results = list(type(commands[0]).execute_batch(commands)) if len(commands) > 1 else [commands[0].execute()]
+        if len(results) != len(commands):
+            raise ValueError(f"{type(commands[0]).__name__}.execute_batch returned {len(results)} results for {len(commands)} commands")
+        return results
+    def _finish(self, items, results=None, error=None):
+        now = time.perf_counter()
+        try:
+            with self.lock:
+                m = self.metrics
+                m["depth"] -= len(items); m["executed"] += len(items); m["batches"] += 1
+                for _, _, submitted in items:
+                    m["latency_total"] += now - submitted; m["latency_max"] = max(m["latency_max"], now - submitted)
+            for i, (_, future, _) in enumerate(items):
+                if error is not None: future.set_exception(error)
+                else: future.set_result(results[i])
+        finally:
+            for _ in items: self.slots.release()
+    def _abandon(self, key, error):
+        # Last resort if a drain dies: fail whatever is still queued so the lane can start afresh
+        with self.lock:
+            lane = self.lanes.pop(key, deque()); self.metrics["depth"] -= len(lane)
+        for _, future, _ in lane:
+            if future.set_running_or_notify_cancel(): future.set_exception(error)
+            self.slots.release()
+    def _drain(self, key):
+        try:
+            while (groups := self._take(key)) is not None:
+                for items in groups:
+                    try: results = self._run(items)
+                    except Exception as error: self._finish(items, error=error)
+                    else: self._finish(items, results)
+        except BaseException as error: self._abandon(key, error); raise
+    async def _drain_async(self, key):
+        try:
+            while (groups := self._take(key)) is not None:
+                for items in groups:
+                    try:
+                        results = self._run(items)
+                        results = [await r if inspect.isawaitable(r) else r for r in results]
+                    except Exception as error: self._finish(items, error=error)
+                    else: self._finish(items, results)
+        except BaseException as error: self._abandon(key, error); raise
+    def stats(self):
+        with self.lock: m = dict(self.metrics)
+        m["latency_avg"] = m["latency_total"] / m["executed"] if m["executed"] else 0.0
+        return m
+    def close(self):
+        if self.executor == "thread": self.pool.shutdown(wait=True)
+        elif self.executor == "asyncio":
+            while self.stats()["depth"]: time.sleep(0.001)
+            self.loop.call_soon_threadsafe(self.loop.stop)
 
 light = Light()
 command = LightOnCommand(light)
-print(command.execute())  # Light on
\ No newline at end of file
+print(command.execute())  # Light on
+
+for executor in ("inline", "thread", "asyncio"):
+    bus = CommandBus(executor)
+    lights = [Light() for _ in range(10)]
+    start = time.perf_counter()
+    futures = [bus.submit((LightOnCommand if i % 200 < 100 else LightOffCommand)(lights[i % 10])) for i in range(20_000)]
+    print(executor, futures[0].result(), futures[-1].result(), end=" ")
+    bus.close()
+    stats = bus.stats()
+    print(f"{(time.perf_counter() - start) * 1e3:.0f} ms, {stats['batches']} batches for {stats['executed']} commands, "
+          f"max depth {stats['max_depth']}, avg latency {stats['latency_avg'] * 1e3:.2f} ms")
\ No newline at end of file
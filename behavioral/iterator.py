@@ -1,4 +1,16 @@
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
 class MyList:
+    # Iterable, not an iterator: every for-loop gets a fresh MyListIterator
+    def __init__(self, items): self.items = items
+    def __iter__(self): return MyListIterator(self.items)
+
+class MyListIterator:
     def __init__(self, items): self.items = items; self.index = 0
     def __iter__(self): return self
     def __next__(self):
@@ -8,5 +20,69 @@ class MyList:
             return result
         raise StopIteration
 
+class Stream:
+    # Reusable pipeline over any source; source is an iterable or a zero-argument callable returning one
+    # (use a callable for one-shot sources like files or generators so each pass reopens them)
+    def __init__(self, source): self.source = source
+    def __iter__(self): return iter(self.source() if callable(self.source) else self.source)
+    def _then(self, step): return Stream(lambda: step(iter(self)))
+    def chunked(self, n):
+        def step(it):
+            while chunk := list(itertools.islice(it, n)): yield chunk
+        return self._then(step)
+    def prefetch(self, k):
+        # Reads up to k items ahead on a background thread to overlap source I/O with the consumer
+        def step(it):
+            buffer, done = queue.Queue(k), object()
+            stop = threading.Event()
+            def produce():
+                try:
+                    for item in it:
+                        while not stop.is_set():
+                            try: buffer.put((item, None), timeout=0.1); break
+                            except queue.Full: pass
+                        if stop.is_set(): return
+                    buffer.put((done, None))
+                except BaseException as error: buffer.put((done, error))
+            threading.Thread(target=produce, daemon=True).start()
+            try:
+                while True:
+                    item, error = buffer.get()
+                    if item is done:
+                        if error is not None: raise error
+                        return
+                    yield item
+            finally: stop.set()  # Consumer stopped early: let the producer thread exit
+        return self._then(step)
+    def parallel_map(self, fn, workers=4, ordered=True, processes=False, in_flight=None):
+        # At most in_flight items (default 2 * workers) are submitted but not yet yielded
+        limit = in_flight or 2 * workers
+        def step(it):
+            with (ProcessPoolExecutor if processes else ThreadPoolExecutor)(workers) as pool:
+                pending = deque(pool.submit(fn, item) for item in itertools.islice(it, limit))
+                while pending:
+                    if ordered: finished = [pending.popleft()]
+                    else:
+                        finished = wait(pending, return_when=FIRST_COMPLETED).done
+                        for future in finished: pending.remove(future)
+                    for future in finished: yield future.result()
+                    pending.extend(pool.submit(fn, item) for item in itertools.islice(it, len(finished)))
+        return self._then(step)
+
 lst = MyList([1, 2, 3])
-for item in lst: print(item)  # 1 2 3
\ No newline at end of file
+for item in lst: print(item)  # 1 2 3
+print(list(lst))  # [1, 2, 3] -- traversable again
+
+def slow_source():
+    for i in range(20): time.sleep(0.005); yield i  # Simulated I/O per record
+def slow_transform(x): time.sleep(0.005); return x * x
+
+feed = Stream(slow_source)
+print(list(feed.chunked(8)))  # [[0..7], [8..15], [16..19]]
+for label, pipeline in (("plain", Stream(slow_source)), ("prefetch", feed.prefetch(8))):
+    start = time.perf_counter()
+    for item in pipeline: slow_transform(item)
+    print(f"{label:>14}: {(time.perf_counter() - start) * 1e3:.0f} ms")
+start = time.perf_counter()
+result = list(feed.prefetch(8).parallel_map(slow_transform, workers=4))
+print(f"{'parallel_map':>14}: {(time.perf_counter() - start) * 1e3:.0f} ms", result[:5])  # [0, 1, 4, 9, 16]
\ No newline at end of file
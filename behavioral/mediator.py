@@ -1,10 +1,92 @@
+import asyncio
+import time
+
+class Member:
+    # One bounded queue and consumer task per member
+    def __init__(self, user, queue_size):
+        self.user = user; self.queue = asyncio.Queue(queue_size); self.task = None; self.errors = 0
+    async def run(self):
+        while True:
+            payload, sent_at = await self.queue.get()
+            try: await self.user.receive(payload, sent_at)
+            except Exception: self.errors += 1  # A failing receiver must not kill its consumer task
+            finally: self.queue.task_done()
+    def close(self):
+        # Cancel the consumer and mark undelivered messages done, so a drain() already waiting can finish
+        self.task.cancel()
+        while not self.queue.empty(): self.queue.get_nowait(); self.queue.task_done()
+
 class ChatRoom:
+    def __init__(self, queue_size=64): self.members = {}; self.queue_size = queue_size; self.evicted = []
     def show_message(self, user, message): return f"{user} says: {message}"
+    def join(self, user):
+        # Call from inside the running loop; names are unique within a room
+        if user.name in self.members: raise ValueError(f"{user.name!r} is already in the room")
+        member = self.members[user.name] = Member(user, self.queue_size)
+        member.task = asyncio.get_running_loop().create_task(member.run())
+    def leave(self, name):
+        member = self.members.pop(name, None)
+        if member: member.close()
+    def broadcast(self, sender, message):
+        # Encoded once; every recipient gets the same read-only memoryview, never a copy
+        # Returns the number of members the message was queued for
+        payload, sent_at = memoryview(self.show_message(sender, message).encode()).toreadonly(), time.perf_counter()
+        delivered = 0
+        for name, member in list(self.members.items()):
+            if name == sender: continue
+            try: member.queue.put_nowait((payload, sent_at)); delivered += 1
+            except asyncio.QueueFull: self.evicted.append(name); self.leave(name)  # Too slow to keep up
+        return delivered
+    async def drain(self): await asyncio.gather(*(m.queue.join() for m in list(self.members.values())))
 
 class User:
-    def __init__(self, name, chatroom): self.name = name; self.chatroom = chatroom
+    def __init__(self, name, chatroom): self.name = name; self.chatroom = chatroom; self.received = 0; self.latencies = []
     def send(self, message): return self.chatroom.show_message(self.name, message)
+    def post(self, message): return self.chatroom.broadcast(self.name, message)
+    async def receive(self, payload, sent_at):
+        self.received += 1; self.latencies.append(time.perf_counter() - sent_at)
+
+class SlowUser(User):
+    async def receive(self, payload, sent_at): await asyncio.sleep(1)
 
 chat = ChatRoom()
 user1 = User("Alice", chat)
-print(user1.send("Hi!"))  # Alice says: Hi!
\ No newline at end of file
+print(user1.send("Hi!"))  # Alice says: Hi!
+
+async def main():
+    room = ChatRoom(queue_size=4)
+    alice, bob, slow = User("Alice", room), User("Bob", room), SlowUser("Slowpoke", room)
+    for user in (alice, bob, slow): room.join(user)
+    for i in range(10):
+        alice.post(f"message {i}")
+        await asyncio.sleep(0)
+    await room.drain()
+    print(bob.received, room.evicted)  # 10 ['Slowpoke']
+
+    class BrokenUser(User):
+        async def receive(self, payload, sent_at): raise RuntimeError("bad client")
+    room = ChatRoom()
+    for user in (User("Alice", room), BrokenUser("Broken", room)): room.join(user)
+    for i in range(3): room.broadcast("Alice", f"message {i}")
+    await room.drain()
+    print(room.members["Broken"].errors)  # 3
+    room.leave("Alice"); room.leave("Broken")
+
+    # Benchmark: messages/sec and p99 delivery latency as the room grows
+    for size in (100, 1_000, 10_000):
+        room = ChatRoom(queue_size=1_000)
+        users = [User(f"user{i}", room) for i in range(size)]
+        for user in users: room.join(user)
+        messages = 200_000 // size
+        start = time.perf_counter()
+        for i in range(messages):
+            users[0].post(f"hello {i}")
+            await asyncio.sleep(0)  # Let consumers run between posts, as a real server would
+        await room.drain()
+        elapsed = time.perf_counter() - start
+        latencies = sorted(latency for user in users for latency in user.latencies)
+        print(f"{size:>6} members: {messages / elapsed:>8,.0f} messages/s, {len(latencies) / elapsed:>10,.0f} deliveries/s, "
+              f"p99 latency {latencies[int(len(latencies) * 0.99)] * 1e3:.1f} ms")
+        for name in list(room.members): room.leave(name)
+
+asyncio.run(main())
\ No newline at end of file
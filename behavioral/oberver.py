@@ -1,8 +1,78 @@
+import asyncio
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+IN_FLIGHT = object()
+
 class NewsAgency:
-    def __init__(self): self.subscribers = []; self.news = ""
-    def subscribe(self, sub): self.subscribers.append(sub)
-    def notify(self): return [sub.update(self.news) for sub in self.subscribers]
-    def add_news(self, news): self.news = news; self.notify()
+    # Subscribers are held weakly, in subscription order. mode: "sync" (inline, returns results), "thread"
+    # (thread pool) or "asyncio" (tasks on the running loop). In the concurrent modes a busy subscriber only
+    # gets the latest news, and errors and timeouts go to self.errors. Timeouts are per subscriber, counted
+    # from when its update starts: enforced in asyncio mode, reported once the update returns otherwise.
+    def __init__(self, mode="sync", workers=4, timeout=None):
+        if mode not in ("sync", "thread", "asyncio"): raise ValueError(f"Unknown mode {mode!r}")
+        self.mode = mode; self.timeout = timeout; self.news = ""
+        self.subscribers = {}  # id(sub) -> weakref; a dict keeps subscription order, unlike a WeakSet
+        self.errors = deque(maxlen=100)  # (subscriber, exception)
+        self.pending = {}  # id(sub) -> latest undelivered news, or IN_FLIGHT
+        self.lock = threading.Lock(); self.inflight = set()
+        self.pool = ThreadPoolExecutor(workers) if mode == "thread" else None
+    def subscribe(self, sub):
+        key = id(sub)
+        self.subscribers[key] = weakref.ref(sub, lambda _, key=key: self.subscribers.pop(key, None))
+    def unsubscribe(self, sub): self.subscribers.pop(id(sub), None)
+    def notify(self):
+        # Sync mode returns one result per live subscriber: its return value or the exception it raised
+        results = []
+        for key, ref in list(self.subscribers.items()):
+            sub = ref()
+            if sub is None: continue
+            if self.mode == "sync": results.append(self._call(sub, self.news)); continue
+            with self.lock:
+                if key in self.pending: self.pending[key] = self.news; continue  # Busy: coalesce into the latest
+                self.pending[key] = IN_FLIGHT
+            if self.mode == "thread": work = self.pool.submit(self._drain, key, ref, self.news)
+            else: work = asyncio.get_running_loop().create_task(self._drain_async(key, ref, self.news))
+            self.inflight.add(work); work.add_done_callback(self.inflight.discard)
+        return results if self.mode == "sync" else None
+    def _call(self, sub, news):
+        started = time.monotonic()
+        try: result = sub.update(news)
+        except Exception as e: self.errors.append((sub, e)); return e
+        if self.timeout is not None and time.monotonic() - started > self.timeout:
+            self.errors.append((sub, TimeoutError(f"{type(sub).__name__} took longer than {self.timeout}s")))
+        return result
+    def _next(self, key):
+        with self.lock:
+            news = self.pending.get(key, IN_FLIGHT)
+            if news is IN_FLIGHT: self.pending.pop(key, None); return IN_FLIGHT
+            self.pending[key] = IN_FLIGHT
+            return news
+    def _drain(self, key, ref, news):
+        while news is not IN_FLIGHT:
+            sub = ref()
+            if sub is None: self.pending.pop(key, None); return
+            self._call(sub, news); del sub
+            news = self._next(key)
+    async def _drain_async(self, key, ref, news):
+        while news is not IN_FLIGHT:
+            sub = ref()
+            if sub is None: self.pending.pop(key, None); return
+            update = sub.update
+            try:
+                if asyncio.iscoroutinefunction(update): await asyncio.wait_for(update(news), self.timeout)
+                else: await asyncio.wait_for(asyncio.to_thread(update, news), self.timeout)
+            except Exception as e: self.errors.append((sub, e))  # Includes asyncio.TimeoutError
+            del sub, update
+            news = self._next(key)
+    def flush(self):
+        while self.inflight: wait(list(self.inflight))
+    async def flush_async(self):
+        while self.inflight: await asyncio.gather(*list(self.inflight), return_exceptions=True)
+    def add_news(self, news): self.news = news; return self.notify()
 
 class Subscriber:
     def update(self, news): return f"Got news: {news}"
@@ -10,4 +80,30 @@ class Subscriber:
 agency = NewsAgency()
 sub = Subscriber()
 agency.subscribe(sub)
-agency.add_news("Breaking!")  # [Got news: Breaking!]
\ No newline at end of file
+agency.add_news("Breaking!")  # [Got news: Breaking!]
+del sub
+print(agency.add_news("Nobody listening"))  # []
+
+class Slow(Subscriber):
+    def update(self, news): time.sleep(0.1); return super().update(news)
+class Fast(Subscriber): pass
+
+pooled = NewsAgency("thread", workers=1, timeout=0.05)
+subs = [Slow(), Slow(), Fast()]
+for s in subs: pooled.subscribe(s)
+pooled.add_news("Queued behind slow subscribers")
+pooled.flush()
+print([type(s).__name__ for s, _ in pooled.errors])  # ['Slow', 'Slow'] -- Fast waited in the queue but is not blamed
+
+class Reader:
+    def __init__(self): self.seen = []
+    async def update(self, news): self.seen.append(news); await asyncio.sleep(0.01)
+
+async def main():
+    live = NewsAgency("asyncio", timeout=1.0)
+    reader = Reader()
+    live.subscribe(reader)
+    for i in range(5): live.add_news(f"update {i}")
+    await live.flush_async()
+    print(reader.seen)  # ['update 0', 'update 4'] -- intermediate news coalesced while the reader was busy
+asyncio.run(main())
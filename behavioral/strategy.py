@@ -1,15 +1,152 @@
+import heapq
+import itertools
+import pickle
+import random
+import tempfile
+import time
+from collections.abc import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # Sorter simply never picks NumpySort
+    np = None
+
 class SortStrategy:
     def sort(self, data): pass
 
 class BubbleSort(SortStrategy):
-    def sort(self, data): return sorted(data)  # Simplified
+    def sort(self, data):
+        items = list(data)
+        for end in range(len(items) - 1, 0, -1):
+            swapped = False
+            for i in range(end):
+                if items[i + 1] < items[i]: items[i], items[i + 1] = items[i + 1], items[i]; swapped = True
+            if not swapped: break
+        return items
 
 class QuickSort(SortStrategy):
-    def sort(self, data): return sorted(data, reverse=True)  # Simplified
+    def sort(self, data):
+        # Three-way partitioning around a random pivot, with an explicit stack instead of recursion
+        items = list(data)
+        stack = [(0, len(items) - 1)]
+        while stack:
+            low, high = stack.pop()
+            if low >= high: continue
+            pivot = items[random.randint(low, high)]
+            lt, i, gt = low, low, high
+            while i <= gt:
+                if items[i] < pivot: items[lt], items[i] = items[i], items[lt]; lt += 1; i += 1
+                elif pivot < items[i]: items[gt], items[i] = items[i], items[gt]; gt -= 1
+                else: i += 1
+            stack.append((low, lt - 1)); stack.append((gt + 1, high))
+        return items
+
+class TimSort(SortStrategy):
+    def sort(self, data): return sorted(data)
+
+class CountingSort(SortStrategy):
+    # Integers whose range is not much larger than their count
+    def sort(self, data):
+        if not data: return []
+        low = min(data)
+        counts = [0] * (max(data) - low + 1)
+        for value in data: counts[value - low] += 1
+        return [value for value, count in enumerate(counts, low) for _ in range(count)]
+
+class RadixSort(SortStrategy):
+    # LSD radix sort on bytes; negatives are shifted up by the minimum first
+    def sort(self, data):
+        if not data: return []
+        low = min(data)
+        items, shift, top = [value - low for value in data], 0, max(data) - low
+        while top >> shift:
+            buckets = [[] for _ in range(256)]
+            for value in items: buckets[(value >> shift) & 0xFF].append(value)
+            items = list(itertools.chain.from_iterable(buckets)); shift += 8
+        return [value + low for value in items]
+
+class NumpySort(SortStrategy):
+    def sort(self, data, key=None):
+        # With a key, argsort the numeric keys and gather the records in that order
+        if key is not None:
+            order = np.argsort(np.fromiter((key(item) for item in data), dtype=float, count=len(data)), kind="stable")
+            return [data[i] for i in order]
+        return np.sort(np.asarray(data), kind="stable").tolist()
+
+class ExternalMergeSort(SortStrategy):
+    # For data larger than memory: sort runs of run_size items, spill each to a temp file, k-way merge
+    def __init__(self, run_size=100_000): self.run_size = run_size
+    def sort(self, data):
+        runs, it = [], iter(data)
+        while run := sorted(itertools.islice(it, self.run_size)):
+            spill = tempfile.TemporaryFile()
+            for i in range(0, len(run), 1000): pickle.dump(run[i:i + 1000], spill)  # Blocks of 1000 items
+            spill.seek(0); runs.append(spill)
+        yield from heapq.merge(*(self._read(spill) for spill in runs))
+    @staticmethod
+    def _read(spill):
+        with spill:
+            while True:
+                try: yield from pickle.load(spill)
+                except EOFError: return
 
 class Sorter:
-    def __init__(self, strategy): self.strategy = strategy
-    def sort(self, data): return self.strategy.sort(data)
+    # With no strategy, samples each input and picks one. sort() always returns a list, like sorted();
+    # iter_sort() streams the result, which keeps the external merge sort's output lazy.
+    def __init__(self, strategy=None, memory_limit=5_000_000): self.strategy = strategy; self.memory_limit = memory_limit
+    def choose(self, data):
+        if not hasattr(data, "__len__") or len(data) > self.memory_limit: return ExternalMergeSort()
+        if len(data) < 64: return TimSort()
+        if not isinstance(data, Sequence): data = list(data)  # Sets, dict views: sampling needs indexing
+        positions = sorted(random.sample(range(len(data)), min(len(data), 256)))
+        sample = [data[i] for i in positions]
+        if all(a <= b for a, b in itertools.pairwise(sample)): return TimSort()  # Looks presorted: runs are cheap
+        if all(type(value) is int for value in sample) and all(type(value) is int for value in data):
+            span = max(data) - min(data)
+            if span <= 2 * len(data): return CountingSort()
+            return NumpySort() if np and -2**63 <= min(data) and max(data) < 2**63 else RadixSort()
+        if np and all(type(value) is float for value in sample) and all(type(value) is float for value in data):
+            return NumpySort()  # Only homogeneous dtypes: mixing ints in would round them through float64
+        return TimSort()
+    def iter_sort(self, data):
+        if not hasattr(data, "__len__"):
+            # Buffer up to memory_limit items; only an iterator longer than that spills to disk
+            it = iter(data)
+            data = list(itertools.islice(it, self.memory_limit + 1))
+            if len(data) > self.memory_limit: data = itertools.chain(data, it)
+        elif not isinstance(data, Sequence): data = list(data)
+        return iter((self.strategy or self.choose(data)).sort(data))
+    def sort(self, data): return list(self.iter_sort(data))
 
 sorter = Sorter(BubbleSort())
-print(sorter.sort([3, 1, 2]))  # [1, 2, 3]
\ No newline at end of file
+print(sorter.sort([3, 1, 2]))  # [1, 2, 3]
+print(Sorter(QuickSort()).sort([3, 1, 2]))  # [1, 2, 3]
+print(type(Sorter().choose([random.randrange(100) for _ in range(1000)])).__name__)  # CountingSort
+print(Sorter().sort(iter([5, 3, 9])))  # [3, 5, 9] -- buffered and sorted in memory
+print(Sorter(memory_limit=2).sort(iter([5, 3, 9])))  # [3, 5, 9] -- longer than memory_limit: external merge sort
+print(Sorter().sort(set(range(100, 0, -1)))[:3], Sorter().sort([10**17 + 1] + [0.5] * 99)[-1])  # [1, 2, 3] 100000000000000001
+
+# Benchmark matrix: strategy x size x distribution (ms)
+distributions = {
+    "small ints": lambda n: [random.randrange(1000) for _ in range(n)],
+    "wide ints": lambda n: [random.randrange(-2**40, 2**40) for _ in range(n)],
+    "floats": lambda n: [random.random() for _ in range(n)],
+    "sorted": lambda n: list(range(n)),
+    "strings": lambda n: [str(random.random()) for _ in range(n)],
+}
+strategies = [("bubble", BubbleSort()), ("quick", QuickSort()), ("timsort", TimSort()), ("counting", CountingSort()),
+              ("radix", RadixSort()), ("numpy", NumpySort()), ("external", ExternalMergeSort(20_000)), ("auto", Sorter())]
+print(f"{'':>20}" + "".join(f"{name:>10}" for name, _ in strategies))
+for n in (1_000, 100_000):
+    for dist, make in distributions.items():
+        data, row = make(n), []
+        for name, strategy in strategies:
+            unsuited = (name in ("counting", "radix") and dist in ("floats", "strings")
+                        or name == "counting" and dist == "wide ints" or name == "bubble" and n > 1_000)
+            if unsuited or (name == "numpy" and not np):
+                row.append(f"{'-':>10}"); continue
+            start = time.perf_counter()
+            result = list(strategy.sort(data))
+            row.append(f"{(time.perf_counter() - start) * 1e3:>10.1f}")
+            assert result == sorted(data), name
+        print(f"{dist + ' ' + str(n):>20}" + "".join(row))
\ No newline at end of file
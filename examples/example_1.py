@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 import time
 import weakref
 from threading import Lock
-from typing import List
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
 
 # Creational Pattern: Singleton
 # Ensures only one instance of OrderLogger exists
@@ -77,19 +80,107 @@ class LoggingPaymentDecorator(PaymentProcessor):
 # Behavioral Pattern: Observer
 # Notifies subscribers (e.g., customer, warehouse) when an order status changes
 class OrderSubject:
-    def __init__(self):
-        self._observers = []
+    """Holds observers weakly and fans status changes out in one of three modes:
+    "sync" (inline), "thread" (thread pool) or "asyncio" (tasks on the running loop).
+    In the concurrent modes a slow observer only ever receives the latest status, and
+    failures or timeouts are collected in errors instead of reaching the caller."""
+    _IN_FLIGHT = object()
+
+    def __init__(self, mode: str = "sync", max_workers: int = 4, timeout: Optional[float] = None):
+        if mode not in ("sync", "thread", "asyncio"):
+            raise ValueError(f"Unknown notification mode: {mode}")
+        self._observers: Dict[int, weakref.ref] = {}
         self._status = "Pending"
+        self.mode = mode
+        self.timeout = timeout  # Per observer; enforced in asyncio mode, reported late in thread mode
+        self.errors: Deque[Tuple[object, BaseException]] = deque(maxlen=100)
+        self._pending: Dict[int, object] = {}  # observer key -> latest undelivered status, or _IN_FLIGHT
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(max_workers) if mode == "thread" else None
+        self._inflight: set = set()  # Futures or tasks still delivering
 
     def attach(self, observer):
-        self._observers.append(observer)
+        key = id(observer)
+        self._observers[key] = weakref.ref(observer, lambda _, key=key: self._observers.pop(key, None))
 
     def detach(self, observer):
-        self._observers.remove(observer)
+        self._observers.pop(id(observer), None)
 
     def notify(self):
-        for observer in self._observers:
-            observer.update(self._status)
+        for key, ref in list(self._observers.items()):
+            observer = ref()
+            if observer is None:
+                continue
+            if self.mode == "sync":
+                self._deliver(observer, self._status)
+                continue
+            with self._lock:
+                if key in self._pending:  # Still busy: coalesce into the latest status
+                    self._pending[key] = self._status
+                    continue
+                self._pending[key] = self._IN_FLIGHT
+            if self.mode == "thread":
+                work = self._executor.submit(self._drain, key, ref, self._status)
+            else:
+                work = asyncio.get_running_loop().create_task(self._drain_async(key, ref, self._status))
+            self._inflight.add(work)
+            work.add_done_callback(self._inflight.discard)
+
+    def _deliver(self, observer, status: str):
+        started = time.monotonic()
+        try:
+            observer.update(status)
+        except Exception as e:
+            self.errors.append((observer, e))
+            return
+        if self.timeout is not None and time.monotonic() - started > self.timeout:
+            self.errors.append((observer, TimeoutError(f"update took longer than {self.timeout}s")))
+
+    def _next_status(self, key: int):
+        with self._lock:
+            status = self._pending.get(key, self._IN_FLIGHT)
+            if status is self._IN_FLIGHT:
+                self._pending.pop(key, None)
+                return self._IN_FLIGHT
+            self._pending[key] = self._IN_FLIGHT
+            return status
+
+    def _drain(self, key: int, ref: weakref.ref, status: str):
+        while status is not self._IN_FLIGHT:
+            observer = ref()
+            if observer is None:
+                self._pending.pop(key, None)
+                return
+            self._deliver(observer, status)
+            del observer
+            status = self._next_status(key)
+
+    async def _drain_async(self, key: int, ref: weakref.ref, status: str):
+        while status is not self._IN_FLIGHT:
+            observer = ref()
+            if observer is None:
+                self._pending.pop(key, None)
+                return
+            update = observer.update
+            try:
+                if asyncio.iscoroutinefunction(update):
+                    await asyncio.wait_for(update(status), self.timeout)
+                else:
+                    await asyncio.wait_for(asyncio.to_thread(update, status), self.timeout)
+            except Exception as e:  # Includes asyncio.TimeoutError
+                self.errors.append((observer, e))
+            del observer, update
+            status = self._next_status(key)
+
+    def flush(self):
+        """Thread mode: blocks until every queued delivery has finished."""
+        while self._inflight:
+            wait(list(self._inflight))
+
+    async def flush_async(self):
+        """Asyncio mode: waits until every queued delivery has finished."""
+        while self._inflight:
+            await asyncio.gather(*list(self._inflight), return_exceptions=True)
 
     def set_status(self, status: str):
         self._status = status
@@ -141,32 +232,139 @@ class Order:
 
 # Modern Pattern: Circuit Breaker
 # Prevents repeated calls to a failing service (simulated inventory check)
+# Trips on the failure rate or slow-call rate over a sliding window of recent calls
+class CircuitOpenError(Exception):
+    pass
+
 class CircuitBreaker:
-    def __init__(self, failure_threshold: int = 3):
-        self.state = "CLOSED"
-        self.failure_count = 0
-        self.failure_threshold = failure_threshold
+    CLOSED, OPEN, HALF_OPEN = "CLOSED", "OPEN", "HALF_OPEN"
+
+    def __init__(self, window_size: int = 20, min_calls: int = 5, failure_rate: float = 0.5,
+                 slow_call_rate: float = 1.0, slow_call_duration: float = 2.0,
+                 reset_timeout: float = 5.0, half_open_calls: int = 3, half_open_timeout: float = 10.0,
+                 listeners: Iterable = ()):
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_rate = slow_call_rate
+        self.slow_call_duration = slow_call_duration
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.half_open_timeout = half_open_timeout  # Probes that never report back are written off after this
+        self.state = self.CLOSED  # Read without the lock; only written under it
+        self.listeners: List = list(listeners)  # listener(old_state, new_state), called outside the lock
+        self.metrics = dict.fromkeys(("calls", "successes", "failures", "slow_calls", "rejected", "opened"), 0)
+        self.generation = 0  # Bumped on every transition; outcomes of calls admitted earlier are ignored
+        self._lock = Lock()
+        self._reset_window()
+
+    def _reset_window(self):
+        self._outcomes = [(False, False)] * self.window_size  # Ring buffer of (failed, slow)
+        self._next = 0
+        self._filled = 0
+        self._failures = 0
+        self._slow = 0
+        self._probes = 0
+        self._probe_successes = 0
         self.last_failure_time = None
+        self.half_opened_at = None
+
+    def _set_state(self, state: str):
+        old, self.state = self.state, state
+        self.generation += 1
+        self._reset_window()
+        if state == self.OPEN:
+            self.metrics["opened"] += 1
+            self.last_failure_time = time.monotonic()
+        elif state == self.HALF_OPEN:
+            self.half_opened_at = time.monotonic()
+        return old, state
+
+    def _notify(self, transition):
+        if transition:
+            for listener in self.listeners:
+                listener(*transition)
+
+    def _acquire(self) -> Tuple[str, int]:
+        """Admits a call or raises CircuitOpenError; the returned (state, generation) token goes to _record."""
+        generation = self.generation
+        if self.state == self.CLOSED:
+            return self.CLOSED, generation
+        transition = None
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.last_failure_time >= self.reset_timeout:
+                transition = self._set_state(self.HALF_OPEN)
+            if (self.state == self.HALF_OPEN and self._probes >= self.half_open_calls
+                    and time.monotonic() - self.half_opened_at >= self.half_open_timeout):
+                # Re-grant the slots of probes that never reported back
+                self._probes = self._probe_successes
+                self.half_opened_at = time.monotonic()
+            permitted = self.state == self.CLOSED or (
+                self.state == self.HALF_OPEN and self._probes < self.half_open_calls)
+            if self.state == self.HALF_OPEN and permitted:
+                self._probes += 1
+            if not permitted:
+                self.metrics["rejected"] += 1
+            token = (self.state, self.generation)
+        self._notify(transition)
+        if not permitted:
+            raise CircuitOpenError("Circuit is open, service unavailable")
+        return token
+
+    def _record(self, started: float, failed: bool, token: Optional[Tuple[str, int]] = None):
+        slow = time.monotonic() - started >= self.slow_call_duration
+        transition = None
+        with self._lock:
+            self.metrics["calls"] += 1
+            self.metrics["failures" if failed else "successes"] += 1
+            self.metrics["slow_calls"] += slow
+            if token is not None and token[1] != self.generation:
+                pass  # Admitted in an earlier state, e.g. a slow CLOSED-era call finishing during HALF_OPEN
+            elif self.state == self.HALF_OPEN:
+                if failed or slow:
+                    transition = self._set_state(self.OPEN)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_calls:
+                        transition = self._set_state(self.CLOSED)
+            elif self.state == self.CLOSED:
+                old_failed, old_slow = self._outcomes[self._next]
+                if self._filled == self.window_size:
+                    self._failures -= old_failed
+                    self._slow -= old_slow
+                else:
+                    self._filled += 1
+                self._outcomes[self._next] = (failed, slow)
+                self._failures += failed
+                self._slow += slow
+                self._next = (self._next + 1) % self.window_size
+                if self._filled >= self.min_calls and (
+                        self._failures / self._filled >= self.failure_rate
+                        or self._slow / self._filled >= self.slow_call_rate):
+                    transition = self._set_state(self.OPEN)
+        self._notify(transition)
 
     def call(self, func, *args, **kwargs):
-        if self.state == "OPEN":
-            if time.time() - self.last_failure_time > 5:  # Reset after 5 seconds
-                self.state = "HALF_OPEN"
-            else:
-                raise Exception("Circuit is open, service unavailable")
-        
+        token = self._acquire()
+        started = time.monotonic()
         try:
             result = func(*args, **kwargs)
-            if self.state == "HALF_OPEN":
-                self.state = "CLOSED"
-                self.failure_count = 0
-            return result
-        except Exception as e:
-            self.failure_count += 1
-            if self.failure_count >= self.failure_threshold:
-                self.state = "OPEN"
-                self.last_failure_time = time.time()
-            raise e
+        except BaseException:  # Includes cancellation, so a HALF_OPEN probe always reports back
+            self._record(started, True, token)
+            raise
+        self._record(started, False, token)
+        return result
+
+    async def call_async(self, func, *args, **kwargs):
+        token = self._acquire()
+        started = time.monotonic()
+        try:
+            result = await func(*args, **kwargs)
+        except BaseException:  # Includes cancellation, so a HALF_OPEN probe always reports back
+            self._record(started, True, token)
+            raise
+        self._record(started, False, token)
+        return result
 
 # Main execution
 if __name__ == "__main__":
@@ -194,6 +392,7 @@ if __name__ == "__main__":
 
     # Circuit Breaker for inventory check
     breaker = CircuitBreaker()
+    breaker.listeners.append(lambda old, new: logger.log(f"Inventory breaker {old} -> {new}"))
     order.add_item(1, 100.0)
     total = order.calculate_total()
 
@@ -203,4 +402,20 @@ if __name__ == "__main__":
         decorated_payment.process(total)
         order.subject.set_status("Processed")
     else:
-        print("Inventory unavailable")
\ No newline at end of file
+        print("Inventory unavailable")
+
+    # Concurrent fan-out: a slow warehouse no longer delays customers and only sees the latest status
+    class SlowWarehouse(Warehouse):
+        def update(self, status: str):
+            time.sleep(0.05)
+            super().update(status)
+
+    tracking = OrderSubject(mode="thread")
+    slow_warehouse = SlowWarehouse()
+    tracking.attach(customer)
+    tracking.attach(slow_warehouse)
+    for status in ("Packed", "Shipped", "Out for delivery", "Delivered"):
+        tracking.set_status(status)
+    tracking.flush()  # Warehouse hears "Packed" then "Delivered"
+    del customer  # Weakly held: dropped observers disappear from the subject
+    print(len(tracking._observers))  # 1
\ No newline at end of file
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+import re
 import threading
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import time
 import uuid
 
@@ -116,34 +117,65 @@ class TaskWithMetadata(Task):
 # Behavioral Pattern: Chain of Responsibility
 # Handles task approval through a chain of validators
 class TaskValidator(ABC):
+    _links_version = 0  # Bumped by every set_next, so a cached chain rewired further down is rebuilt too
+
     def __init__(self):
         self.next_validator: Optional[TaskValidator] = None
+        self._compiled: Optional[Tuple[int, List[TaskValidator]]] = None
 
     def set_next(self, validator: 'TaskValidator') -> 'TaskValidator':
         self.next_validator = validator
+        TaskValidator._links_version += 1
         return validator
 
     @abstractmethod
-    def validate(self, task: Task) -> bool:
+    def check(self, task: Task) -> Optional[str]:
+        """Returns the failure reason, or None if the task passes this validator."""
         pass
 
-class DescriptionValidator(TaskValidator):
+    def compile(self) -> List['TaskValidator']:
+        # Flatten the chain once so validation is a loop rather than recursion; cached until relinked
+        if self._compiled is not None and self._compiled[0] == TaskValidator._links_version:
+            return self._compiled[1]
+        chain, validator = [], self
+        while validator is not None:
+            chain.append(validator)
+            validator = validator.next_validator
+        self._compiled = (TaskValidator._links_version, chain)
+        return chain
+
     def validate(self, task: Task) -> bool:
-        if not task.description:
-            print("Validation failed: Empty description")
-            return False
-        if self.next_validator:
-            return self.next_validator.validate(task)
+        for validator in self.compile():
+            error = validator.check(task)
+            if error:
+                print(f"Validation failed: {error}")
+                return False
         return True
 
+    def validate_many(self, tasks: List[Task]) -> List[Optional[str]]:
+        """Validates a batch against one compiled chain; returns each task's failure reason or None."""
+        checks = [validator.check for validator in self.compile()]
+        results = []
+        for task in tasks:
+            error = None
+            for check in checks:
+                error = check(task)
+                if error:
+                    break
+            results.append(error)
+        return results
+
+class DescriptionValidator(TaskValidator):
+    def check(self, task: Task) -> Optional[str]:
+        if not task.description:
+            return "Empty description"
+        return None
+
 class PriorityValidator(TaskValidator):
-    def validate(self, task: Task) -> bool:
+    def check(self, task: Task) -> Optional[str]:
         if isinstance(task, PriorityTask) and task.priority < 0:
-            print("Validation failed: Negative priority")
-            return False
-        if self.next_validator:
-            return self.next_validator.validate(task)
-        return True
+            return "Negative priority"
+        return None
 
 # Behavioral Pattern: Mediator
 # Coordinates task execution between components
@@ -165,7 +197,15 @@ class TaskMediator:
 
 # Behavioral Pattern: Visitor
 # Adds external operations (e.g., reporting) to tasks
+def handler_name(node_type: type, suffix: str = "") -> str:
+    """visit_<snake_case class name><suffix>, e.g. RightTriangle -> visit_right_triangle, HTTPTask -> visit_http_task."""
+    words = re.sub(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])", "_", node_type.__name__)
+    return f"visit_{words.lower()}{suffix}"
+
 class TaskVisitor(ABC):
+    """Dispatches on the task's type through a per-visitor-class table instead of accept() calls.
+    A task type maps to visit_<snake_case class name>, falling back along its MRO."""
+
     @abstractmethod
     def visit_simple_task(self, task: SimpleTask):
         pass
@@ -174,6 +214,29 @@ class TaskVisitor(ABC):
     def visit_priority_task(self, task: PriorityTask):
         pass
 
+    @classmethod
+    def _handler(cls, task_type: type):
+        table = cls.__dict__.get("_dispatch")
+        if table is None:
+            table = cls._dispatch = {}
+        handler = table.get(task_type)
+        if handler is None:
+            for base in task_type.__mro__:
+                handler = getattr(cls, handler_name(base), None)
+                if handler is not None:
+                    break
+            else:
+                raise TypeError(f"{cls.__name__} cannot visit {task_type.__name__}")
+            table[task_type] = handler
+        return handler
+
+    def visit(self, task: Task):
+        return self._handler(type(task))(self, task)
+
+    def visit_many(self, tasks: List[Task]) -> list:
+        handler_for = self._handler
+        return [handler_for(type(task))(self, task) for task in tasks]
+
 class ReportVisitor(TaskVisitor):
     def visit_simple_task(self, task: SimpleTask):
         print(f"Report: Simple task {task.id} - {task.description}")
@@ -236,6 +299,8 @@ if __name__ == "__main__":
     desc_validator = DescriptionValidator()
     prio_validator = PriorityValidator()
     desc_validator.set_next(prio_validator)
+    bad_task = factory.create_task("")
+    print(desc_validator.validate_many([task, bad_task]))  # [None, 'Empty description']
 
     # Mediator
     mediator = TaskMediator()
@@ -245,7 +310,7 @@ if __name__ == "__main__":
     # Visitor
     reporter = ReportVisitor()
     task.accept(reporter)
-    cloned_task.accept(reporter)
+    reporter.visit_many([cloned_task, SimpleTask("Write docs")])
 
     # Saga
     saga = TaskSaga()
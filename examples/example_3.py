@@ -1,6 +1,13 @@
 from abc import ABC, abstractmethod
+from array import array
+import bisect
+from collections import deque
+import json
+import mmap
+import os
+import struct
 import threading
-from typing import List, Dict
+from typing import Deque, List, Dict, Optional, Tuple
 import time
 
 # Creational Pattern: Builder
@@ -91,29 +98,105 @@ class EditCommand(ABC):
     def undo(self):
         pass
 
+    def merge(self, other: 'EditCommand') -> bool:
+        """Absorbs other, an already-executed command that directly follows this one, if compatible."""
+        return False
+
+    def size(self) -> int:
+        """Approximate payload size in bytes, used for the history's memory budget."""
+        return 0
+
 class AddTextCommand(EditCommand):
+    MAX_MERGED = 4096  # Characters per merged command, so one undo never reverts too much
+
     def __init__(self, doc: Document, text: str):
         self.doc = doc
-        self.text = text
+        self.text = text  # Merged texts are stored as one string plus their lengths
+        self.lengths = array("B" if len(text) < 256 else "I", [len(text)])
 
     def execute(self):
-        self.doc.content.append(self.text)
+        position = 0
+        for length in self.lengths:
+            self.doc.content.append(self.text[position:position + length])
+            position += length
 
     def undo(self):
-        self.doc.content.pop()
+        del self.doc.content[len(self.doc.content) - len(self.lengths):]
+
+    def merge(self, other: EditCommand) -> bool:
+        if (type(other) is not AddTextCommand or other.doc is not self.doc
+                or len(self.text) + len(other.text) > self.MAX_MERGED):
+            return False
+        self.text += other.text
+        if other.lengths.typecode == "I" and self.lengths.typecode == "B":
+            self.lengths = array("I", self.lengths)  # Widen once a piece no longer fits in a byte
+        self.lengths.fromlist(other.lengths.tolist())
+        return True
+
+    def size(self) -> int:
+        return len(self.text) + self.lengths.itemsize * len(self.lengths)
+
+class CommandHistory:
+    """Undo/redo stacks that coalesce compatible commands and evict the oldest beyond a budget."""
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 1 << 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.undo_stack: Deque[EditCommand] = deque()
+        self.redo_stack: List[EditCommand] = []
+        self.bytes = 0
+
+    def push(self, command: EditCommand):
+        for undone in self.redo_stack:
+            self.bytes -= undone.size()
+        self.redo_stack.clear()
+        if self.undo_stack and self._merge(self.undo_stack[-1], command):
+            pass
+        else:
+            self.undo_stack.append(command)
+            self.bytes += command.size()
+        while self.undo_stack and (len(self.undo_stack) > self.max_entries or self.bytes > self.max_bytes):
+            self.bytes -= self.undo_stack.popleft().size()
+
+    def _merge(self, top: EditCommand, command: EditCommand) -> bool:
+        before = top.size()
+        if not top.merge(command):
+            return False
+        self.bytes += top.size() - before
+        return True
+
+    def undo(self) -> bool:
+        if not self.undo_stack:
+            return False
+        command = self.undo_stack.pop()
+        command.undo()
+        self.redo_stack.append(command)
+        return True
+
+    def redo(self) -> bool:
+        if not self.redo_stack:
+            return False
+        command = self.redo_stack.pop()
+        command.execute()
+        self.undo_stack.append(command)
+        return True
+
+    def __len__(self) -> int:
+        return len(self.undo_stack) + len(self.redo_stack)
 
 class Editor:
-    def __init__(self):
-        self.history: List[EditCommand] = []
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 1 << 20):
+        self.history = CommandHistory(max_entries, max_bytes)
 
     def execute_command(self, command: EditCommand):
         command.execute()
-        self.history.append(command)
+        self.history.push(command)
 
     def undo_last(self):
-        if self.history:
-            command = self.history.pop()
-            command.undo()
+        self.history.undo()
+
+    def redo_last(self):
+        self.history.redo()
 
 # Behavioral Pattern: State
 # Manages document states (e.g., Draft, Published)
@@ -142,21 +225,38 @@ class PublishedState(DocumentState):
     def publish(self, doc: Document) -> str:
         return "Already published"
 
+# States are stateless, so every context shares one instance of each
+DRAFT = DraftState()
+PUBLISHED = PublishedState()
+
 class DocumentContext:
+    # (state, event) -> next state; events without an entry leave the state unchanged
+    TRANSITIONS: Dict[Tuple[DocumentState, str], DocumentState] = {
+        (DRAFT, "publish"): PUBLISHED,
+    }
+
     def __init__(self):
-        self.state = DraftState()
+        self.state: DocumentState = DRAFT
         self.doc = Document()
+        self.hooks: List = []  # hook(old_state, event, new_state)
 
     def set_state(self, state: DocumentState):
         self.state = state
 
+    def _transition(self, event: str):
+        target = self.TRANSITIONS.get((self.state, event))
+        if target is not None:
+            previous = self.state
+            self.set_state(target)
+            for hook in self.hooks:
+                hook(previous, event, target)
+
     def edit(self, editor: Editor, text: str):
         return self.state.edit(self.doc, editor, text)
 
     def publish(self) -> str:
         result = self.state.publish(self.doc)
-        if "published" in result.lower():
-            self.set_state(PublishedState())
+        self._transition("publish")
         return result
 
 # Modern Pattern: Event Sourcing
@@ -166,17 +266,185 @@ class DocumentEvent:
         self.event_type = event_type
         self.data = data
 
+# Durable backend: append-only segment files of binary records
+# Record layout: <type_len:u16><data_len:u32><type bytes><JSON data bytes>
+class SegmentedEventLog:
+    HEADER = struct.Struct("<HI")
+    INDEX_ENTRY = struct.Struct("<QQ")  # (record offset, byte position) every index_interval records
+
+    def __init__(self, directory: str, segment_size: int = 64 * 1024 * 1024,
+                 index_interval: int = 256, fsync_every: int = 64):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.index_interval = index_interval
+        self.fsync_every = fsync_every  # Group commit: fsync once per N appends (0 = only on flush())
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self.segments: List[int] = []  # Base offset of each segment, ascending
+        self.indexes: List[List[Tuple[int, int]]] = []  # Sparse index per segment
+        os.makedirs(directory, exist_ok=True)
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".log"):
+                base = int(name[:-4])
+                self.segments.append(base)
+                self.indexes.append(self._load_index(base))
+        if not self.segments:
+            self.segments.append(0)
+            self.indexes.append([])
+        self.next_offset, self._position = self._recover_tail()
+        self._log = open(self._path(self.segments[-1], ".log"), "ab")
+        self._index = open(self._path(self.segments[-1], ".idx"), "ab")
+
+    def _path(self, base: int, suffix: str) -> str:
+        return os.path.join(self.directory, f"{base:020d}{suffix}")
+
+    def _load_index(self, base: int) -> List[Tuple[int, int]]:
+        try:
+            with open(self._path(base, ".idx"), "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return []
+        usable = len(raw) - len(raw) % self.INDEX_ENTRY.size
+        return list(self.INDEX_ENTRY.iter_unpack(raw[:usable]))
+
+    def _recover_tail(self) -> Tuple[int, int]:
+        # Scan the last segment from its last index entry and truncate any torn record.
+        # An index entry can reach disk without its record, so entries past the log's end are dropped.
+        base, index = self.segments[-1], self.indexes[-1]
+        path = self._path(base, ".log")
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        while index and index[-1][1] >= size:
+            index.pop()
+        offset, position = index[-1] if index else (base, 0)
+        if size:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                while position + self.HEADER.size <= size:
+                    type_len, data_len = self.HEADER.unpack_from(mm, position)
+                    end = position + self.HEADER.size + type_len + data_len
+                    if end > size:
+                        break
+                    position, offset = end, offset + 1
+        if position < size:
+            with open(path, "r+b") as f:
+                f.truncate(position)
+        while index and index[-1][1] >= position:
+            index.pop()  # Pointed at the torn record; re-added when that offset is appended again
+        index_path = self._path(base, ".idx")
+        if os.path.exists(index_path) and os.path.getsize(index_path) != len(index) * self.INDEX_ENTRY.size:
+            with open(index_path, "r+b") as f:
+                f.truncate(len(index) * self.INDEX_ENTRY.size)
+        return offset, position
+
+    def _roll(self):
+        self._sync()
+        self._log.close()
+        self._index.close()
+        self.segments.append(self.next_offset)
+        self.indexes.append([])
+        self._position = 0
+        self._log = open(self._path(self.next_offset, ".log"), "ab")
+        self._index = open(self._path(self.next_offset, ".idx"), "ab")
+
+    def _sync(self):
+        self._log.flush()
+        self._index.flush()
+        os.fsync(self._log.fileno())
+        os.fsync(self._index.fileno())
+        self._unsynced = 0
+
+    def append(self, event_type: str, data: Dict) -> int:
+        type_bytes = event_type.encode()
+        data_bytes = json.dumps(data, separators=(",", ":")).encode()
+        record = self.HEADER.pack(len(type_bytes), len(data_bytes)) + type_bytes + data_bytes
+        with self._lock:
+            if self._position and self._position + len(record) > self.segment_size:
+                self._roll()
+            offset = self.next_offset
+            if (offset - self.segments[-1]) % self.index_interval == 0:
+                self.indexes[-1].append((offset, self._position))
+                self._index.write(self.INDEX_ENTRY.pack(offset, self._position))
+            self._log.write(record)
+            self._position += len(record)
+            self.next_offset += 1
+            self._unsynced += 1
+            if self.fsync_every and self._unsynced >= self.fsync_every:
+                self._sync()
+            return offset
+
+    def flush(self):
+        with self._lock:
+            self._sync()
+
+    def close(self):
+        with self._lock:
+            self._sync()
+            self._log.close()
+            self._index.close()
+
+    def read(self, from_offset: int = 0):
+        """Yields (offset, type memoryview, data memoryview) straight out of the mapped segments.
+        Views are only valid until the next record is requested."""
+        with self._lock:
+            self._log.flush()
+            end_offset = self.next_offset
+        first = max(bisect.bisect_right(self.segments, from_offset) - 1, 0)
+        for i in range(first, len(self.segments)):
+            path = self._path(self.segments[i], ".log")
+            if os.path.getsize(path) == 0:
+                continue
+            index = self.indexes[i]
+            j = bisect.bisect_right(index, (from_offset, float("inf"))) - 1
+            offset, position = index[j] if j >= 0 else (self.segments[i], 0)
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mm)
+            try:
+                while offset < end_offset and position + self.HEADER.size <= len(view):
+                    type_len, data_len = self.HEADER.unpack_from(view, position)
+                    start = position + self.HEADER.size
+                    position = start + type_len + data_len
+                    if offset >= from_offset:
+                        yield offset, view[start:start + type_len], view[start + type_len:position]
+                    offset += 1
+            finally:
+                view.release()
+                try:
+                    mm.close()
+                except BufferError:
+                    pass  # The caller still holds a view; the mapping is freed with it
+
+    def __enter__(self) -> 'SegmentedEventLog':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 class EventStore:
-    def __init__(self):
+    ADD_TEXT = b"add_text"
+
+    def __init__(self, log: Optional[SegmentedEventLog] = None):
         self.events: List[DocumentEvent] = []
+        self.log = log
 
     def add_event(self, event: DocumentEvent):
-        self.events.append(event)
-
-    def replay(self, doc: Document):
-        for event in self.events:
-            if event.event_type == "add_text":
-                doc.content.append(event.data["text"])
+        if self.log is None:
+            self.events.append(event)
+        else:
+            self.log.append(event.event_type, event.data)
+
+    def replay(self, doc: Document, from_offset: int = 0) -> int:
+        """Applies events from from_offset onwards and returns the next offset to resume from."""
+        if self.log is None:
+            for event in self.events[from_offset:]:
+                if event.event_type == "add_text":
+                    doc.content.append(event.data["text"])
+            return len(self.events)
+        next_offset = from_offset
+        for offset, event_type, data in self.log.read(from_offset):
+            if event_type == self.ADD_TEXT:
+                doc.content.append(json.loads(str(data, "utf-8"))["text"])
+            next_offset = offset + 1
+        return next_offset
 
 # Main execution
 if __name__ == "__main__":
@@ -203,8 +471,30 @@ if __name__ == "__main__":
     print(context.publish())
     print(context.edit(editor, "More content"))  # Should fail due to Published state
 
+    # Coalescing undo/redo history stays bounded under a million keystrokes
+    typing_doc = Document()
+    typing_editor = Editor(max_entries=100)
+    for i in range(1_000_000):
+        typing_editor.execute_command(AddTextCommand(typing_doc, "k"))
+    typing_editor.undo_last()
+    typing_editor.redo_last()
+    print(len(typing_editor.history), typing_editor.history.bytes, len(typing_doc.content))  # 100 812160 1000000
+
     # Event Sourcing to track changes
     store = EventStore()
     store.add_event(DocumentEvent("add_text", {"text": "Event-sourced text"}))
     store.replay(doc)
-    print(doc)
\ No newline at end of file
+    print(doc)
+
+    # Durable event log: resume replay from a checkpoint after a restart
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        with SegmentedEventLog(directory, segment_size=4096, fsync_every=100) as log:
+            durable = EventStore(log)
+            for i in range(1000):
+                durable.add_event(DocumentEvent("add_text", {"text": f"line {i}"}))
+            checkpoint = durable.replay(Document())
+        with SegmentedEventLog(directory, segment_size=4096) as log:  # Reopened, as after a restart
+            EventStore(log).add_event(DocumentEvent("add_text", {"text": "after restart"}))
+            resumed = Document()
+            print(EventStore(log).replay(resumed, from_offset=checkpoint), resumed.content)  # 1001 ['after restart']
\ No newline at end of file
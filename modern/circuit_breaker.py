@@ -1,22 +1,151 @@
+import asyncio
+import threading
+import time
+
+CLOSED, OPEN, HALF_OPEN = "CLOSED", "OPEN", "HALF_OPEN"
+
 class CircuitBreaker:
-    def __init__(self, failure_threshold=3):
-        self.state = "CLOSED"
-        self.failures = 0
-        self.threshold = failure_threshold
-    def call(self, func):
-        if self.state == "OPEN": return "Circuit open, call blocked"
-        try:
-            result = func()
-            self.failures = 0
-            return result
+    def __init__(self, window_size=20, min_calls=5, failure_rate=0.5, slow_call_rate=1.0, slow_call_duration=2.0,
+                 reset_timeout=5.0, half_open_calls=3, half_open_timeout=10.0, listeners=()):
+        self.window_size = window_size; self.min_calls = min_calls
+        self.failure_rate = failure_rate; self.slow_call_rate = slow_call_rate
+        self.slow_call_duration = slow_call_duration; self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.half_open_timeout = half_open_timeout  # Probes that never report back are written off after this
+        self.listeners = list(listeners)  # listener(old_state, new_state), called outside the lock
+        self.state = CLOSED  # Plain attribute: readers never take the lock
+        self.lock = threading.Lock()
+        self.metrics = dict.fromkeys(("calls", "successes", "failures", "slow_calls", "rejected", "opened"), 0)
+        self.generation = 0  # Bumped on every transition; outcomes of calls admitted earlier are ignored
+        self._reset_window()
+    def _reset_window(self):
+        # Ring buffer of the last window_size outcomes with running totals
+        self.failed = bytearray(self.window_size); self.slow = bytearray(self.window_size)
+        self.pos = self.filled = self.failed_count = self.slow_count = 0
+        self.probes = self.probe_successes = 0
+        self.opened_at = self.half_opened_at = None
+    def _transition(self, new_state):
+        # Caller holds the lock; returns the (old, new) pair for listeners to run after release
+        old, self.state = self.state, new_state
+        self.generation += 1
+        if new_state == OPEN: self.metrics["opened"] += 1
+        self._reset_window()
+        if new_state == OPEN: self.opened_at = time.monotonic()
+        if new_state == HALF_OPEN: self.half_opened_at = time.monotonic()
+        return old, new_state
+    def _fire(self, transition):
+        if transition:
+            for listener in self.listeners: listener(*transition)
+
+    def allow(self):
+        # Returns a (state, generation) token to pass to record(), or None if the call is rejected
+        generation = self.generation
+        if self.state == CLOSED: return (CLOSED, generation)  # Fast path without the lock
+        transition = None
+        with self.lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                transition = self._transition(HALF_OPEN)
+            if (self.state == HALF_OPEN and self.probes >= self.half_open_calls
+                    and time.monotonic() - self.half_opened_at >= self.half_open_timeout):
+                self.probes = self.probe_successes; self.half_opened_at = time.monotonic()  # Re-grant lost probes
+            allowed = self.state == CLOSED or (self.state == HALF_OPEN and self.probes < self.half_open_calls)
+            if self.state == HALF_OPEN and allowed: self.probes += 1
+            if not allowed: self.metrics["rejected"] += 1
+            token = (self.state, self.generation) if allowed else None
+        self._fire(transition)
+        return token
+    def record(self, duration, failed, token=None):
+        slow = duration >= self.slow_call_duration
+        transition = None
+        with self.lock:
+            self.metrics["calls"] += 1
+            self.metrics["failures" if failed else "successes"] += 1
+            self.metrics["slow_calls"] += slow
+            if token is not None and token[1] != self.generation:
+                pass  # Admitted in an earlier state, e.g. a slow CLOSED-era call finishing during HALF_OPEN
+            elif self.state == HALF_OPEN:
+                # Any bad probe reopens; all probes good closes
+                if failed or slow: transition = self._transition(OPEN)
+                else:
+                    self.probe_successes += 1
+                    if self.probe_successes >= self.half_open_calls: transition = self._transition(CLOSED)
+            elif self.state == CLOSED:
+                if self.filled == self.window_size:
+                    self.failed_count -= self.failed[self.pos]; self.slow_count -= self.slow[self.pos]
+                else: self.filled += 1
+                self.failed[self.pos] = failed; self.slow[self.pos] = slow
+                self.failed_count += failed; self.slow_count += slow
+                self.pos = (self.pos + 1) % self.window_size
+                if self.filled >= self.min_calls and (self.failed_count / self.filled >= self.failure_rate
+                                                      or self.slow_count / self.filled >= self.slow_call_rate):
+                    transition = self._transition(OPEN)
+        self._fire(transition)
+
+    def call(self, func, *args, **kwargs):
+        token = self.allow()
+        if token is None: return "Circuit open, call blocked"
+        start = time.monotonic()
+        try: result = func(*args, **kwargs)
         except Exception:
-            self.failures += 1
-            if self.failures >= self.threshold: self.state = "OPEN"
+            self.record(time.monotonic() - start, True, token)
             return "Call failed"
+        except BaseException:
+            self.record(time.monotonic() - start, True, token)  # Interrupted calls still give back their probe slot
+            raise
+        self.record(time.monotonic() - start, False, token)
+        return result
+
+class AsyncCircuitBreaker(CircuitBreaker):
+    async def call(self, func, *args, **kwargs):
+        token = self.allow()
+        if token is None: return "Circuit open, call blocked"
+        start = time.monotonic()
+        try: result = await func(*args, **kwargs)
+        except Exception:
+            self.record(time.monotonic() - start, True, token)
+            return "Call failed"
+        except BaseException:
+            self.record(time.monotonic() - start, True, token)  # Cancelled, e.g. by asyncio.wait_for
+            raise
+        self.record(time.monotonic() - start, False, token)
+        return result
 
 def risky_call(): raise Exception("Oops")
 
-cb = CircuitBreaker()
+cb = CircuitBreaker(min_calls=3, reset_timeout=0.1, half_open_calls=1, listeners=[lambda old, new: print(f"{old} -> {new}")])
 print(cb.call(risky_call))  # Call failed
 print(cb.call(risky_call))  # Call failed
-print(cb.call(risky_call))  # Circuit open, call blocked
\ No newline at end of file
+print(cb.call(risky_call))  # CLOSED -> OPEN\nCall failed
+print(cb.call(risky_call))  # Circuit open, call blocked
+time.sleep(0.1)
+print(cb.call(lambda: "ok"))  # OPEN -> HALF_OPEN\nHALF_OPEN -> CLOSED\nok
+print(cb.metrics)
+
+async def main():
+    acb = AsyncCircuitBreaker(half_open_calls=2)
+    async def fetch(): await asyncio.sleep(0); return "fetched"
+    print(await acb.call(fetch))  # fetched
+
+    # A cancelled HALF_OPEN probe counts as a failure instead of holding its slot forever
+    acb = AsyncCircuitBreaker(min_calls=1, reset_timeout=0.05, half_open_calls=1)
+    await acb.call(fetch_fails)
+    await asyncio.sleep(0.05)
+    try: await asyncio.wait_for(acb.call(asyncio.sleep, 1), 0.01)
+    except asyncio.TimeoutError: pass
+    await asyncio.sleep(0.05)
+    print(acb.state, await acb.call(fetch), acb.state)  # OPEN fetched CLOSED
+
+    # A slow call admitted while CLOSED cannot close the breaker by finishing during HALF_OPEN
+    acb = AsyncCircuitBreaker(min_calls=2, reset_timeout=0.05, half_open_calls=1)
+    async def slow(delay): await asyncio.sleep(delay); return "late"
+    straggler = asyncio.create_task(acb.call(slow, 0.2))
+    await asyncio.sleep(0)
+    await acb.call(fetch_fails); await acb.call(fetch_fails)
+    await asyncio.sleep(0.05)
+    probe = asyncio.create_task(acb.call(slow, 0.3))
+    await straggler
+    print(acb.state)  # HALF_OPEN -- only the probe's own outcome counts
+    await probe
+
+async def fetch_fails(): raise Exception("Oops")
+asyncio.run(main())
\ No newline at end of file
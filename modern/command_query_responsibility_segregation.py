@@ -1,12 +1,107 @@
+import queue
+import threading
+import time
+
 class PostWriteModel:
-    def __init__(self): self.posts = {}
-    def create_post(self, id, title): self.posts[id] = {"title": title}
+    def __init__(self): self.posts = {}; self.events = []; self.listeners = []; self.lock = threading.Lock()
+    def _emit(self, type, id, data):
+        # Events are (sequence, type, id, data); the lock keeps sequence order and delivery order equal
+        with self.lock:
+            event = (len(self.events) + 1, type, id, data)
+            self.events.append(event)
+            for listener in self.listeners: listener(event)
+    def create_post(self, id, title): self.posts[id] = {"title": title}; self._emit("created", id, {"title": title})
+    def rename_post(self, id, title): self.posts[id]["title"] = title; self._emit("renamed", id, {"title": title})
+    def delete_post(self, id): del self.posts[id]; self._emit("deleted", id, {})
+
+class Projection:
+    # A denormalized read view built only from write-side events
+    def __init__(self): self.reset()
+    def reset(self): pass
+    def apply(self, event): pass
+
+class PostTitles(Projection):
+    def reset(self): self.titles = {}
+    def apply(self, event):
+        _, type, id, data = event
+        if type == "deleted": self.titles.pop(id, None)
+        else: self.titles[id] = data["title"]
+
+class TitleIndex(Projection):
+    def reset(self): self.ids = {}; self.words = {}  # word -> post ids, post id -> words
+    def apply(self, event):
+        _, type, id, data = event
+        for word in self.words.pop(id, ()):
+            self.ids[word].discard(id)
+            if not self.ids[word]: del self.ids[word]
+        if type != "deleted":
+            self.words[id] = set(data["title"].lower().split())
+            for word in self.words[id]: self.ids.setdefault(word, set()).add(id)
+    def search(self, word): return sorted(self.ids.get(word.lower(), ()))
+
+class PostCount(Projection):
+    def reset(self): self.count = 0
+    def apply(self, event): self.count += {"created": 1, "deleted": -1}.get(event[1], 0)
+
+class Projector:
+    # Background worker that feeds one projection from the write model's events in batches
+    def __init__(self, write_model, projection, batch_size=256):
+        self.write_model = write_model; self.projection = projection; self.batch_size = batch_size
+        self.position = 0  # Sequence of the last applied event
+        self.applied = threading.Condition()
+        self.queue = queue.Queue()
+        write_model.listeners.append(self.queue.put)
+        threading.Thread(target=self._run, daemon=True).start()
+    def _apply(self, events):
+        with self.applied:
+            for event in events:
+                if event[0] > self.position:  # Skip events already covered by a rebuild
+                    self.projection.apply(event); self.position = event[0]
+            self.applied.notify_all()
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty(): batch.append(self.queue.get_nowait())
+            self._apply(batch)
+    def lag(self): return len(self.write_model.events) - self.position
+    def wait(self, max_lag=0, timeout=None, read=None):
+        # Bounded staleness: block until at most max_lag events behind the write side. read(projection), if
+        # given, runs under the projector lock so the worker cannot mutate the projection mid-read
+        target = len(self.write_model.events) - max_lag
+        with self.applied:
+            if not self.applied.wait_for(lambda: self.position >= target, timeout):
+                raise TimeoutError(f"{type(self.projection).__name__} is {self.lag()} events behind")
+            return read(self.projection) if read else self.projection
+    def rebuild(self, batch_size=10_000):
+        # Replay the full history in bulk while holding the (reentrant) lock, so the worker cannot apply a
+        # live event mid-replay and move position past history. Live events queued meanwhile are then
+        # deduplicated by position.
+        with self.applied:
+            self.projection.reset(); self.position = 0
+            history = list(self.write_model.events)
+            for i in range(0, len(history), batch_size): self._apply(history[i:i + batch_size])
 
 class PostReadModel:
-    def __init__(self, write_model): self.posts = write_model.posts
-    def get_post(self, id): return self.posts.get(id, {}).get("title", "Not found")
+    def __init__(self, write_model):
+        self.titles = Projector(write_model, PostTitles())
+        self.index = Projector(write_model, TitleIndex())
+        self.count = Projector(write_model, PostCount())
+    def get_post(self, id, max_lag=0, timeout=1.0):
+        return self.titles.wait(max_lag, timeout, lambda view: view.titles.get(id, "Not found"))
+    def search(self, word, max_lag=0, timeout=1.0): return self.index.wait(max_lag, timeout, lambda view: view.search(word))
+    def post_count(self, max_lag=0, timeout=1.0): return self.count.wait(max_lag, timeout, lambda view: view.count)
 
 write = PostWriteModel()
 read = PostReadModel(write)
 write.create_post(1, "Hello World")
-print(read.get_post(1))  # Hello World
\ No newline at end of file
+print(read.get_post(1))  # Hello World
+write.create_post(2, "Hello CQRS")
+write.rename_post(1, "Goodbye World")
+print(read.search("hello"), read.post_count())  # [2] 2
+
+start = time.perf_counter()
+for i in range(3, 100_003): write.create_post(i, f"Post {i}")
+print(f"100k writes in {time.perf_counter() - start:.2f}s, title lag right after: {read.titles.lag()}")
+print(read.post_count(timeout=30))  # 100002
+read.index.rebuild()
+print(read.search("goodbye"))  # [1]
\ No newline at end of file
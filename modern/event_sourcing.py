@@ -1,14 +1,49 @@
+import time
+
 class Event:
+    __slots__ = ("type", "amount")
     def __init__(self, type, amount): self.type = type; self.amount = amount
 
+class Snapshot:
+    __slots__ = ("version", "balance")
+    def __init__(self, version, balance): self.version = version; self.balance = balance
+
 class Account:
-    def __init__(self): self.events = []
-    def deposit(self, amount): self.events.append(Event("deposit", amount))
-    def withdraw(self, amount): self.events.append(Event("withdraw", -amount))
-    def balance(self):
-        return sum(event.amount for event in self.events)
+    def __init__(self, snapshot_every=1000):
+        self.events = []
+        self.snapshots = [Snapshot(0, 0)]  # Snapshot(version, balance), version = events applied
+        self.snapshot_every = snapshot_every
+        self._balance = 0  # Running aggregate, kept in step with self.events
+    def apply(self, event):
+        self.events.append(event)
+        self._balance += event.amount
+        if len(self.events) % self.snapshot_every == 0:
+            self.snapshots.append(Snapshot(len(self.events), self._balance))
+    def deposit(self, amount): self.apply(Event("deposit", amount))
+    def withdraw(self, amount): self.apply(Event("withdraw", -amount))
+    def balance(self): return self._balance
+    def balance_at(self, version):
+        # Replay only from the nearest snapshot at or before `version`
+        if not 0 <= version <= len(self.events): raise ValueError(f"No version {version}")
+        snapshot = self.snapshots[version // self.snapshot_every]
+        return snapshot.balance + sum(e.amount for e in self.events[snapshot.version:version])
 
-account = Account()
+    @classmethod
+    def from_events(cls, events, snapshot_every=1000):
+        account = cls(snapshot_every)
+        for event in events: account.apply(event)
+        return account
+
+account = Account(snapshot_every=2)
 account.deposit(100)
 account.withdraw(30)
-print(account.balance())  # 70
\ No newline at end of file
+account.deposit(5)
+print(account.balance())  # 75
+print(account.balance_at(2))  # 70
+
+# Benchmark: balance() and balance_at() cost stays flat as history grows
+for size in (10_000, 100_000, 1_000_000):
+    big = Account.from_events(Event("deposit", 1) for _ in range(size))
+    start = time.perf_counter()
+    for _ in range(1000): big.balance(); big.balance_at(size - 1)
+    print(f"{size:>9} events: {(time.perf_counter() - start) * 1e3:.2f} ms / 1000 reads")
\ No newline at end of file
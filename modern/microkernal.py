@@ -1,11 +1,77 @@
+import importlib
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class PluginMetrics:
+    def __init__(self): self.load_time = None; self.calls = 0; self.call_time = 0.0
+    def __repr__(self): return f"PluginMetrics(load_time={self.load_time}, calls={self.calls}, call_time={self.call_time:.6f})"
+
 class Editor:
-    def __init__(self): self.plugins = {}
-    def register_plugin(self, name, plugin): self.plugins[name] = plugin
-    def execute(self, name): return self.plugins[name]() if name in self.plugins else "No plugin"
+    def __init__(self):
+        self.plugins = {}; self.declared = {}; self.metrics = {}
+        self.lock = threading.Lock(); self.load_locks = {}  # One lock per plugin, so loads of different plugins overlap
+    def register_plugin(self, name, plugin): self.plugins[name] = plugin; self.metrics.setdefault(name, PluginMetrics())
+    def declare_plugin(self, name, target):
+        # target is "package.module:attr"; imported (and instantiated, if a class) on first use
+        self.declared[name] = target; self.metrics.setdefault(name, PluginMetrics())
+    def load_manifest(self, manifest):
+        # Entry-point style lines: "name = package.module:attr"
+        for line in manifest.strip().splitlines():
+            if line.strip() and not line.lstrip().startswith("#"):
+                name, target = (part.strip() for part in line.split("=", 1))
+                self.declare_plugin(name, target)
+    def _load(self, name):
+        with self.lock: lock = self.load_locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self.plugins:
+                start = time.perf_counter()
+                module, _, attr = self.declared[name].partition(":")
+                plugin = getattr(importlib.import_module(module), attr)
+                self.plugins[name] = plugin() if isinstance(plugin, type) else plugin
+                self.metrics[name].load_time = time.perf_counter() - start
+        return self.plugins[name]
+    def warm_up(self, names=None, workers=4):
+        # Load declared plugins in the background; execute() still works meanwhile
+        pool = ThreadPoolExecutor(workers)
+        futures = [pool.submit(self._load, name) for name in (names or list(self.declared)) if name not in self.plugins]
+        pool.shutdown(wait=False)
+        return futures
+    def execute(self, name):
+        plugin = self.plugins.get(name)
+        if plugin is None:
+            if name not in self.declared: return "No plugin"
+            plugin = self._load(name)
+        start = time.perf_counter()
+        try: return plugin()
+        finally:
+            metrics = self.metrics[name]; metrics.calls += 1; metrics.call_time += time.perf_counter() - start
 
 class SpellCheckPlugin:
     def __call__(self): return "Spell check done"
 
 editor = Editor()
 editor.register_plugin("spellcheck", SpellCheckPlugin())
-print(editor.execute("spellcheck"))  # Spell check done
\ No newline at end of file
+print(editor.execute("spellcheck"))  # Spell check done
+
+editor.load_manifest(f"""
+    wordcount = {__name__}:SpellCheckPlugin
+    implementation = platform:python_implementation
+""")
+print(editor.execute("wordcount"), editor.metrics["wordcount"].calls)  # Spell check done 1
+editor.warm_up()[0].result()
+print(editor.execute("implementation"), editor.metrics["implementation"].load_time is not None)  # CPython True
+
+# Benchmark: cold start with heavy plugins imported eagerly vs declared lazily
+heavy = ["asyncio:Queue", "email.mime.text:MIMEText", "http.server:HTTPServer", "xml.dom.minidom:Document",
+         "unittest:TestCase", "multiprocessing:Queue", "sqlite3:Row", "json:JSONDecoder"]
+eager = "import importlib\n" + "\n".join(f"importlib.import_module({t.split(':')[0]!r})" for t in heavy)
+for label, code in (("interpreter", "pass"), ("eager imports", eager)):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    print(f"{label:>14}: {(time.perf_counter() - start) * 1e3:.1f} ms")
+start = time.perf_counter()
+Editor().load_manifest("\n".join(f"p{i} = {target}" for i, target in enumerate(heavy)))
+print(f"{'lazy declare':>14}: {(time.perf_counter() - start) * 1e3:.1f} ms on top of interpreter start")
\ No newline at end of file
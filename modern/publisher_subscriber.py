@@ -1,9 +1,116 @@
+import asyncio
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+BLOCK, DROP_OLDEST, DROP_NEWEST = "block", "drop_oldest", "drop_newest"
+
+class Subscription:
+    def __init__(self, subscriber, maxsize=1000, overflow=BLOCK, batch_size=1):
+        if overflow not in (BLOCK, DROP_OLDEST, DROP_NEWEST): raise ValueError(f"Unknown overflow policy {overflow!r}")
+        self.subscriber = subscriber; self.overflow = overflow; self.batch_size = batch_size
+        self.queue = asyncio.Queue(maxsize)
+        self.received = self.delivered = self.dropped = self.errors = 0
+        self.started = time.monotonic()
+        self.task = None
+    async def offer(self, message):
+        self.received += 1
+        if self.queue.full():
+            if self.overflow == DROP_NEWEST: self.dropped += 1; return
+            if self.overflow == DROP_OLDEST:
+                self.queue.get_nowait(); self.queue.task_done(); self.dropped += 1
+        await self.queue.put(message)
+    async def run(self):
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty(): batch.append(self.queue.get_nowait())
+            try:
+                result = self.subscriber(batch if self.batch_size > 1 else batch[0])
+                if inspect.isawaitable(result): await result
+            except Exception: self.errors += 1  # A failing subscriber must not kill its consumer task
+            self.delivered += len(batch)
+            for _ in batch: self.queue.task_done()
+    def stats(self):
+        elapsed = time.monotonic() - self.started
+        return {"lag": self.queue.qsize(), "received": self.received, "delivered": self.delivered,
+                "dropped": self.dropped, "errors": self.errors, "throughput": self.delivered / elapsed if elapsed else 0.0}
+
+class TopicTrie:
+    # Segment trie over "."-separated patterns: "*" matches one segment, "#" matches zero or more.
+    # Match results are kept in an LRU of cache_size topics, so high-cardinality topics stay bounded
+    def __init__(self, cache_size=10_000): self.root = {}; self.cache = OrderedDict(); self.cache_size = cache_size
+    def add(self, pattern, value):
+        node = self.root
+        for segment in pattern.split("."): node = node.setdefault(segment, {})
+        node.setdefault(None, []).append(value)  # Key None holds the values ending at this node
+        self.cache.clear()
+    def remove(self, pattern, value):
+        path, node = [], self.root
+        for segment in pattern.split("."): path.append((node, segment)); node = node[segment]
+        node[None].remove(value)
+        if not node[None]: del node[None]
+        for parent, segment in reversed(path):  # Prune branches left empty
+            if parent[segment]: break
+            del parent[segment]
+        self.cache.clear()
+    def match(self, topic):
+        values = self.cache.get(topic)
+        if values is not None: self.cache.move_to_end(topic); return values
+        found = []
+        self._match(self.root, topic.split("."), 0, found)
+        values = self.cache[topic] = tuple(dict.fromkeys(found))  # Dedupe, keep subscription order
+        if len(self.cache) > self.cache_size: self.cache.popitem(last=False)
+        return values
+    def _match(self, node, segments, i, found):
+        if "#" in node:  # "#" may swallow any number of the remaining segments
+            for j in range(i, len(segments) + 1): self._match(node["#"], segments, j, found)
+        if i == len(segments): found.extend(node.get(None, ())); return
+        for key in (segments[i], "*"):
+            if key in node: self._match(node[key], segments, i + 1, found)
+
+class AsyncMessageBroker:
+    def __init__(self): self.subscribers = {}; self.index = TopicTrie()
+    def subscribe(self, topic, subscriber, maxsize=1000, overflow=BLOCK, batch_size=1):
+        # Must be called from inside the running loop; each subscriber gets its own consumer task.
+        # topic may be a pattern such as "orders.*.paid" or "orders.#"
+        subscription = Subscription(subscriber, maxsize, overflow, batch_size)
+        subscription.task = asyncio.get_running_loop().create_task(subscription.run())
+        self.subscribers.setdefault(topic, []).append(subscription)
+        self.index.add(topic, subscription)
+        return subscription
+    def unsubscribe(self, topic, subscription):
+        self.subscribers[topic].remove(subscription)
+        if not self.subscribers[topic]: del self.subscribers[topic]
+        self.index.remove(topic, subscription)
+        subscription.task.cancel()
+    async def publish(self, topic, message):
+        for subscription in self.index.match(topic): await subscription.offer(message)
+    async def drain(self):
+        await asyncio.gather(*(s.queue.join() for subs in list(self.subscribers.values()) for s in subs))
+    def stats(self): return {topic: [s.stats() for s in subs] for topic, subs in self.subscribers.items()}
+    async def close(self):
+        await self.drain()
+        tasks = [s.task for subs in self.subscribers.values() for s in subs]
+        for task in tasks: task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
 class MessageBroker:
-    def __init__(self): self.subscribers = {}
-    def subscribe(self, topic, subscriber): 
-        self.subscribers.setdefault(topic, []).append(subscriber)
-    def publish(self, topic, message):
-        for sub in self.subscribers.get(topic, []): sub(message)
+    # Sync facade: runs an AsyncMessageBroker on a private event loop thread
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.broker = AsyncMessageBroker()
+    def _run(self, coro): return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+    async def _subscribe(self, *args, **kwargs): return self.broker.subscribe(*args, **kwargs)
+    def subscribe(self, topic, subscriber, **options): return self._run(self._subscribe(topic, subscriber, **options))
+    async def _unsubscribe(self, topic, subscription): self.broker.unsubscribe(topic, subscription)
+    def unsubscribe(self, topic, subscription): self._run(self._unsubscribe(topic, subscription))
+    def publish(self, topic, message): self._run(self.broker.publish(topic, message))  # Returns once queued
+    def drain(self): self._run(self.broker.drain())
+    async def _stats(self): return self.broker.stats()  # Read on the loop thread, which owns the counters
+    def stats(self): return self._run(self._stats())
+    def close(self): self._run(self.broker.close()); self.loop.call_soon_threadsafe(self.loop.stop)
 
 class Subscriber:
     def __init__(self, name): self.name = name
@@ -12,4 +119,43 @@ class Subscriber:
 broker = MessageBroker()
 sub1 = Subscriber("Sub1")
 broker.subscribe("news", sub1)
-broker.publish("news", "Breaking!")  # Sub1 received: Breaking!
\ No newline at end of file
+broker.publish("news", "Breaking!")
+broker.drain()  # Sub1 received: Breaking!
+temporary = broker.subscribe("news", Subscriber("Sub2"))
+broker.unsubscribe("news", temporary)
+broker.publish("news", "Only Sub1 gets this")
+broker.drain()  # Sub1 received: Only Sub1 gets this
+
+# A slow subscriber with drop_oldest no longer stalls the publisher; batches arrive as lists
+async def slow(batch): await asyncio.sleep(0.01)
+broker.subscribe("ticks", slow, maxsize=10, overflow=DROP_OLDEST, batch_size=5)
+broker.subscribe("ticks", lambda batch: None, batch_size=100)
+start = time.perf_counter()
+for i in range(1000): broker.publish("ticks", i)
+print(f"published 1000 in {(time.perf_counter() - start) * 1e3:.1f} ms")
+broker.drain()
+for s in broker.stats()["ticks"]: print({k: s[k] for k in ("received", "delivered", "dropped", "lag")})
+broker.subscribe("orders.*.paid", Subscriber("Billing"))
+broker.subscribe("orders.#", Subscriber("Audit"))
+broker.publish("orders.42.paid", "order 42 paid")
+broker.drain()  # Billing and Audit both receive: order 42 paid
+broker.close()
+
+# Benchmark: 100k subscriptions, trie lookup (cold and cached) vs scanning every pattern
+def scan_match(pattern, topic):
+    p, t = pattern.split("."), topic.split(".")
+    def go(i, j):
+        if i == len(p): return j == len(t)
+        if p[i] == "#": return any(go(i + 1, k) for k in range(j, len(t) + 1))
+        return j < len(t) and p[i] in ("*", t[j]) and go(i + 1, j + 1)
+    return go(0, 0)
+trie, patterns = TopicTrie(), [f"orders.{i}.paid" if i % 10 else f"orders.*.{i}" for i in range(100_000)] + ["orders.#"]
+for i, pattern in enumerate(patterns): trie.add(pattern, i)
+topics = [f"orders.{i}.paid" for i in range(0, 100_000, 1000)]
+for label, lookup in (("trie cold", lambda t: (trie.cache.clear(), trie.match(t))), ("trie cached", trie.match)):
+    start = time.perf_counter()
+    for topic in topics: lookup(topic)
+    print(f"{label}: {(time.perf_counter() - start) / len(topics) * 1e6:.1f} us/publish")
+start = time.perf_counter()
+for topic in topics[:5]: [p for p in patterns if scan_match(p, topic)]
+print(f"linear scan: {(time.perf_counter() - start) / 5 * 1e6:.1f} us/publish")
\ No newline at end of file
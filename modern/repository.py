@@ -1,13 +1,97 @@
+import bisect
+
 class User:
     def __init__(self, id, name): self.id = id; self.name = name
     def __str__(self): return f"User({self.id}, {self.name})"
 
+# Query conditions other than plain equality
+class Range:
+    def __init__(self, low=None, high=None): self.low = low; self.high = high  # Inclusive bounds, None = open
+    def __call__(self, value): return (self.low is None or value >= self.low) and (self.high is None or value <= self.high)
+
+class Prefix:
+    def __init__(self, prefix): self.prefix = prefix
+    def __call__(self, value): return value.startswith(self.prefix)
+
+class HashIndex:
+    def __init__(self, attr): self.attr = attr; self.ids = {}
+    def add(self, value, id): self.ids.setdefault(value, set()).add(id)
+    def remove(self, value, id):
+        self.ids[value].discard(id)
+        if not self.ids[value]: del self.ids[value]
+    def supports(self, condition): return not callable(condition)
+    def lookup(self, condition): return self.ids.get(condition, set())
+
+class SortedIndex:
+    def __init__(self, attr): self.attr = attr; self.entries = []  # Sorted (value, id) pairs
+    def add(self, value, id): bisect.insort(self.entries, (value, id))
+    def remove(self, value, id): del self.entries[bisect.bisect_left(self.entries, (value, id))]
+    def supports(self, condition): return isinstance(condition, (Range, Prefix)) or not callable(condition)
+    def _slice(self, low, high):
+        # (value, id) pairs compare on value first; ids never tie, so bound by value alone
+        start = 0 if low is None else bisect.bisect_left(self.entries, (low,))
+        stop = len(self.entries) if high is None else bisect.bisect_right(self.entries, (high, _Top()))
+        return {id for _, id in self.entries[start:stop]}
+    def lookup(self, condition):
+        if isinstance(condition, Range): return self._slice(condition.low, condition.high)
+        if isinstance(condition, Prefix):
+            start = bisect.bisect_left(self.entries, (condition.prefix,))
+            ids = set()
+            for value, id in self.entries[start:]:
+                if not value.startswith(condition.prefix): break
+                ids.add(id)
+            return ids
+        return self._slice(condition, condition)
+
+class _Top:
+    # Sorts after any id so (value, _Top()) bounds every entry with that value
+    def __lt__(self, other): return False
+    def __gt__(self, other): return True
+
 class UserRepository:
-    def __init__(self): self.users = {}
-    def add(self, user): self.users[user.id] = user
+    INDEX_TYPES = {"hash": HashIndex, "sorted": SortedIndex}
+    def __init__(self, indexes=None):
+        # indexes: {"name": "sorted", "email": "hash"}
+        self.users = {}
+        self.indexes = [self.INDEX_TYPES[kind](attr) for attr, kind in (indexes or {}).items()]
+        self.indexed_values = {}  # id -> values as last indexed, so in-place edits can be unindexed
+    def _unindex(self, id):
+        for index, value in zip(self.indexes, self.indexed_values.pop(id, ())): index.remove(value, id)
+    def _index(self, user):
+        values = tuple(getattr(user, index.attr) for index in self.indexes)
+        for index, value in zip(self.indexes, values): index.add(value, user.id)
+        self.indexed_values[user.id] = values
+    def add(self, user):
+        # Also used after mutating a stored user, to bring its index entries up to date
+        self._unindex(user.id)
+        self.users[user.id] = user
+        self._index(user)
+    def update(self, id, **changes):
+        user = self.users[id]
+        for attr, value in changes.items(): setattr(user, attr, value)
+        self.add(user)
+    def remove(self, id): self._unindex(id); return self.users.pop(id, None)
     def get(self, id): return self.users.get(id)
+    def add_many(self, users):
+        for user in users: self.add(user)
+    def get_many(self, ids): return [self.users.get(id) for id in ids]
+    def find(self, **conditions):
+        # Use the first condition an index can answer for candidates, then filter on the rest
+        for attr, condition in conditions.items():
+            index = next((i for i in self.indexes if i.attr == attr and i.supports(condition)), None)
+            if index is not None:
+                candidates = (self.users[id] for id in sorted(index.lookup(condition)))
+                break
+        else: candidates = self.users.values()  # No usable index: full scan
+        return [user for user in candidates if all(
+            c(getattr(user, a)) if callable(c) else getattr(user, a) == c for a, c in conditions.items())]
 
-repo = UserRepository()
+repo = UserRepository(indexes={"name": "sorted"})
 repo.add(User(1, "Alice"))
 user = repo.get(1)
-print(user)  # User(1, Alice)
\ No newline at end of file
+print(user)  # User(1, Alice)
+repo.add_many([User(2, "Bob"), User(3, "Alex"), User(4, "Carol")])
+print([str(u) for u in repo.find(name=Prefix("Al"))])  # ['User(1, Alice)', 'User(3, Alex)']
+repo.update(3, name="Zed")
+print([str(u) for u in repo.find(name=Range("B", "D"))])  # ['User(2, Bob)', 'User(4, Carol)']
+print([str(u) for u in repo.get_many([4, 5])][0])  # User(4, Carol)
\ No newline at end of file
@@ -1,17 +1,101 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+class SagaStep:
+    def __init__(self, name, action, compensation, depends_on=(), timeout=None):
+        self.name = name; self.action = action; self.compensation = compensation
+        self.depends_on = tuple(depends_on); self.timeout = timeout
+
 class BookingSaga:
-    def __init__(self): self.steps = []; self.compensations = []
-    def add_step(self, action, compensation):
-        self.steps.append(action); self.compensations.append(compensation)
+    # Steps form a DAG: each starts on a thread pool as soon as its dependencies have succeeded
+    def __init__(self, max_workers=8): self.steps = {}; self.max_workers = max_workers; self.timings = {}
+    def add_step(self, action, compensation, name=None, depends_on=(), timeout=None):
+        name = name or action.__name__
+        missing = [dep for dep in depends_on if dep not in self.steps]
+        if missing: raise ValueError(f"Unknown dependencies for {name}: {missing}")  # Also rules out cycles
+        self.steps[name] = SagaStep(name, action, compensation, depends_on, timeout)
+        return name
+    def _layers(self, names):
+        # Reverse topological layers: dependents come before the steps they depend on
+        remaining, layers = set(names), []
+        while remaining:
+            layer = [n for n in remaining if not any(n in self.steps[m].depends_on for m in remaining)]
+            layers.append(layer); remaining -= set(layer)
+        return layers
+    def _timed(self, name, func):
+        start = time.perf_counter()
+        try: return func()
+        finally: self.timings[name] = time.perf_counter() - start
     def execute(self):
-        for i, step in enumerate(self.steps):
-            try: step()
-            except Exception:
-                for comp in self.compensations[:i][::-1]: comp()
-                return "Failed, rolled back"
-        return "Success"
+        # A step that passes its timeout is abandoned, not joined: execute() compensates without waiting for it,
+        # and the step is compensated on its worker thread if it completes successfully later
+        self.timings = {}; self.errors = []  # errors: (compensation name, exception)
+        done, failed, running, abandoned = [], None, {}, []
+        pool = ThreadPoolExecutor(self.max_workers)
+        pending = dict(self.steps)
+        while (pending or running) and failed is None:
+            for name, step in list(pending.items()):
+                if all(dep in done for dep in step.depends_on):
+                    future = pool.submit(self._timed, name, step.action)
+                    running[future] = (step, time.monotonic() + step.timeout if step.timeout else None)
+                    del pending[name]
+            deadlines = [d for _, d in running.values() if d is not None]
+            timeout = max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+            finished, _ = wait(running, timeout, FIRST_COMPLETED)
+            for future in finished:
+                step, _ = running.pop(future)
+                if future.exception() is None: done.append(step.name)
+                elif failed is None: failed = step.name
+            for future, (step, deadline) in list(running.items()):
+                if deadline is not None and time.monotonic() >= deadline:
+                    del running[future]; abandoned.append((future, step)); failed = failed or step.name
+        # Let in-flight steps settle, but no longer than their own deadlines, so completed ones are compensated too
+        deadlines = [d for _, d in running.values()]
+        settle = None if None in deadlines or not deadlines else max(max(deadlines) - time.monotonic(), 0)
+        finished, _ = wait(running, settle)
+        for future, (step, _) in running.items():
+            if future not in finished: abandoned.append((future, step))
+            elif future.exception() is None and step.name not in done: done.append(step.name)
+        if failed is not None:
+            for future, step in abandoned: future.add_done_callback(lambda f, step=step: self._compensate_late(f, step))
+            for layer in self._layers(done):
+                futures = {pool.submit(self._timed, f"compensate {n}", self.steps[n].compensation): n for n in layer}
+                for future, name in futures.items():
+                    try: future.result()
+                    except Exception as error: self.errors.append((name, error))  # Keep rolling back the rest
+        pool.shutdown(wait=False)
+        if failed is None: return "Success"
+        return f"Failed at {failed}, rolled back" + (f" ({len(self.errors)} compensations failed)" if self.errors else "")
+    def _compensate_late(self, future, step):
+        if future.cancelled() or future.exception() is not None: return
+        try: self._timed(f"compensate {step.name}", step.compensation)
+        except Exception as error: self.errors.append((step.name, error))
 
-def book_flight(): print("Flight booked")
+def book_flight(): time.sleep(0.1); print("Flight booked")
 def cancel_flight(): print("Flight canceled")
+def book_hotel(): time.sleep(0.1); print("Hotel booked")
+def cancel_hotel(): print("Hotel canceled")
+def book_car(): time.sleep(0.1); raise Exception("No cars left")
+def send_itinerary(): print("Itinerary sent")
+
 saga = BookingSaga()
 saga.add_step(book_flight, cancel_flight)
-print(saga.execute())  # Flight booked\nSuccess
\ No newline at end of file
+print(saga.execute())  # Flight booked\nSuccess
+
+saga.add_step(book_hotel, cancel_hotel, timeout=1.0)
+saga.add_step(send_itinerary, lambda: None, depends_on=["book_flight", "book_hotel"])
+start = time.perf_counter()
+print(saga.execute(), f"in {time.perf_counter() - start:.2f}s")  # Flight and hotel run concurrently: ~0.1s
+saga.add_step(book_car, lambda: None, depends_on=["book_flight"])
+print(saga.execute())  # Failed at book_car, rolled back (itinerary, then flight and hotel)
+print({name: round(t, 2) for name, t in saga.timings.items()})
+
+def slow_payment(): time.sleep(0.5); print("Payment taken late")
+def refund(): print("Payment refunded")
+def broken_cancel(): raise Exception("Cancel API down")
+timed = BookingSaga()
+timed.add_step(book_flight, broken_cancel)
+timed.add_step(slow_payment, refund, depends_on=["book_flight"], timeout=0.1)
+start = time.perf_counter()
+print(timed.execute(), f"in {time.perf_counter() - start:.2f}s")  # Failed at slow_payment, rolled back (1 compensations failed) in ~0.2s
+time.sleep(0.5)  # Payment taken late\nPayment refunded
\ No newline at end of file
@@ -2,11 +2,16 @@ class Logger:
     def log(self): return "Logged"
 
 class ServiceLocator:
-    def __init__(self): self.services = {}
+    def __init__(self): self.services = {}; self.factories = {}
     def register(self, name, service): self.services[name] = service
-    def get(self, name): return self.services.get(name)
+    def register_factory(self, name, factory): self.factories[name] = factory  # Built on first get()
+    def get(self, name):
+        if name not in self.services and name in self.factories: self.services[name] = self.factories.pop(name)()
+        return self.services.get(name)
 
 locator = ServiceLocator()
 locator.register("logger", Logger())
 logger = locator.get("logger")
-print(logger.log())  # Logged
\ No newline at end of file
+print(logger.log())  # Logged
+locator.register_factory("lazy_logger", Logger)
+print(locator.get("lazy_logger").log())  # Logged
\ No newline at end of file
@@ -1,3 +1,10 @@
+import copy
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
 class User:
     def __init__(self, id, name):
         self.id = id
@@ -10,29 +17,184 @@ class UserRepository:
         self.users = {}
     def add(self, user):
         self.users[user.id] = user
+    def add_many(self, users, updates=()):
+        # updates: (id, {field: value}) pairs for stored users whose fields changed
+        for user in users:
+            self.add(user)
+        for id, changed in updates:
+            for field, value in changed.items():
+                setattr(self.users[id], field, value)
     def get(self, id):
         return self.users.get(id)
 
+class SqliteUserRepository:
+    # Drop-in for UserRepository backed by a SQLite file in WAL mode.
+    # Each thread gets its own connection; sqlite3 caches the prepared statement for each SQL string.
+    # add() writes through immediately; use add_many to write many rows in one transaction.
+    INSERT = "INSERT OR REPLACE INTO users (id, name) VALUES (?, ?)"
+    SELECT = "SELECT id, name FROM users WHERE id = ?"
+    COLUMNS = ("name",)  # Updatable columns
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+        self._connection().execute("CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, name TEXT NOT NULL)")
+    def _connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints; safe with WAL
+            self.local.conn = conn
+            with self.lock:
+                self.connections.append(conn)
+        return conn
+    def add(self, user):
+        self._connection().execute(self.INSERT, (user.id, user.name))
+    def add_many(self, users, updates=()):
+        # updates: (id, {field: value}) pairs; only the changed columns are written
+        conn = self._connection()
+        rows = [(user.id, user.name) for user in users]
+        statements = {}
+        for id, changed in updates:
+            fields = tuple(sorted(field for field in changed if field in self.COLUMNS))
+            if fields:
+                statements.setdefault(fields, []).append([changed[field] for field in fields] + [id])
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(self.INSERT, rows)
+            for fields, params in statements.items():
+                assignments = ", ".join(f"{field} = ?" for field in fields)
+                conn.executemany(f"UPDATE users SET {assignments} WHERE id = ?", params)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    def get(self, id):
+        row = self._connection().execute(self.SELECT, (id,)).fetchone()
+        return User(*row) if row else None
+    def close(self):
+        with self.lock:
+            for conn in self.connections:
+                conn.close()
+            self.connections.clear()
+        self.local = threading.local()
+
 class UnitOfWork:
-    def __init__(self):
-        self.new_objects = []
-        self.dirty_objects = []
-    def register_new(self, obj):
-        self.new_objects.append(obj)
-    def register_dirty(self, obj):
-        self.dirty_objects.append(obj)
-    def commit(self, repo):
-        for obj in self.new_objects:
-            repo.add(obj)
-        for obj in self.dirty_objects:
-            repo.add(obj) 
-        self.new_objects.clear()
-        self.dirty_objects.clear()
+    # Identity map keyed by (type, id); loaded objects are diffed against a snapshot at commit
+    def __init__(self, repo=None):
+        self.repo = repo  # Default repository for objects registered without one
+        self.identity_map = {}  # (type, id) -> obj
+        self.snapshots = {}  # (type, id) -> copy of vars(obj) when loaded or last committed; None if new
+        self.repos = {}  # (type, id) -> repository the object is written to
+        self.forced = set()  # Keys registered dirty explicitly, written in full
+    @staticmethod
+    def _snapshot(obj):
+        return copy.deepcopy(vars(obj))  # Deep, so in-place edits to list or dict fields show up as changes
+    def _track(self, obj, repo, snapshot):
+        key = (type(obj), obj.id)
+        self.identity_map[key] = obj
+        self.snapshots[key] = snapshot
+        self.repos[key] = repo or self.repo
+        return key
+    def load(self, cls, id, repo=None):
+        key = (cls, id)
+        if key not in self.identity_map:
+            obj = (repo or self.repo).get(id)
+            if obj is None:
+                return None
+            self._track(obj, repo, self._snapshot(obj))
+        return self.identity_map[key]
+    def register_new(self, obj, repo=None):
+        key = (type(obj), obj.id)
+        if key not in self.identity_map:
+            self._track(obj, repo, None)
+    def register_dirty(self, obj, repo=None):
+        # Optional: changes to loaded objects are detected automatically. An object that was never loaded
+        # may not be stored yet, so it is written in full (an upsert) rather than as a field diff.
+        key = (type(obj), obj.id)
+        if key not in self.identity_map:
+            self._track(obj, repo, None)
+        self.forced.add(key)
+    def changes(self):
+        # (repo, obj, changed fields) per object; new and forced objects report every field
+        for key, obj in self.identity_map.items():
+            snapshot, state = self.snapshots[key], vars(obj)
+            if snapshot is None or key in self.forced:
+                yield self.repos[key], obj, dict(state)
+            else:
+                changed = {field: value for field, value in state.items()
+                           if field not in snapshot or snapshot[field] != value}
+                if changed:
+                    yield self.repos[key], obj, changed
+    def commit(self, repo=None):
+        if repo is not None:
+            self.repo = repo
+            for key, target in self.repos.items():
+                self.repos[key] = target or repo
+        by_repo = {}
+        for target, obj, changed in self.changes():
+            _, full, partial = by_repo.setdefault(id(target), (target, [], []))
+            (full if self.snapshots[(type(obj), obj.id)] is None else partial).append((obj, changed))
+        for target, full, partial in by_repo.values():
+            # One add_many call per repository, so a SQL-backed repo writes in a single transaction
+            if hasattr(target, "add_many"):
+                target.add_many([obj for obj, _ in full], [(obj.id, changed) for obj, changed in partial])
+            else:
+                for obj, _ in full + partial:
+                    target.add(obj)
+        for key, obj in self.identity_map.items():
+            self.snapshots[key] = self._snapshot(obj)
+        self.forced.clear()
 
 # Usage
 repo = UserRepository()
-uow = UnitOfWork()
+uow = UnitOfWork(repo)
 user = User(1, "Bob")
 uow.register_new(user)
-uow.commit(repo)
-print(repo.get(1))  # Output: User(1, Bob)
\ No newline at end of file
+uow.register_new(user)  # Same identity: written once
+uow.commit()
+print(repo.get(1))  # Output: User(1, Bob)
+loaded = uow.load(User, 1)
+loaded.name = "Robert"  # No register_dirty needed
+print([changed for _, _, changed in uow.changes()])  # Output: [{'name': 'Robert'}]
+uow.commit()
+print(list(uow.changes()))  # Output: []
+loaded.tags = []
+uow.commit()
+loaded.tags.append("admin")  # In-place change to a mutable field
+print([changed for _, _, changed in uow.changes()])  # Output: [{'tags': ['admin']}]
+uow.commit()
+uow.register_dirty(User(7, "Eve"))  # Never loaded: upserted, not diffed
+uow.commit()
+print(repo.get(7))  # Output: User(7, Eve)
+
+with tempfile.TemporaryDirectory() as directory:
+    sql_repo = SqliteUserRepository(os.path.join(directory, "users.db"))
+    sql_uow = UnitOfWork(sql_repo)
+    sql_uow.register_new(User(2, "Alice"))
+    sql_uow.commit()
+    sql_uow.load(User, 2).name = "Alicia"
+    sql_uow.commit()  # UPDATE users SET name = ? WHERE id = ?
+    print(sql_repo.get(2))  # Output: User(2, Alicia)
+
+    # Benchmark: writes and reads per second, dict vs SQLite
+    n = 50_000
+    users = [User(i, f"user{i}") for i in range(n)]
+    for label, make_repo, write in (
+            ("dict add", UserRepository, lambda r: [r.add(u) for u in users]),
+            ("sqlite add", lambda: SqliteUserRepository(os.path.join(directory, "a.db")), lambda r: [r.add(u) for u in users]),
+            ("sqlite add_many", lambda: SqliteUserRepository(os.path.join(directory, "b.db")), lambda r: r.add_many(users))):
+        bench_repo = make_repo()
+        start = time.perf_counter()
+        write(bench_repo)
+        writes = n / (time.perf_counter() - start)
+        start = time.perf_counter()
+        for i in range(0, n, 10):
+            bench_repo.get(i)
+        reads = n / 10 / (time.perf_counter() - start)
+        print(f"{label:>22}: {writes:>12,.0f} writes/s {reads:>12,.0f} reads/s")
+        if hasattr(bench_repo, "close"):
+            bench_repo.close()
+    sql_repo.close()
\ No newline at end of file